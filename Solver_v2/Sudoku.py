@@ -378,6 +378,9 @@ class BackgroundBoardNbN:
         self.cell_rows = []
         self.cell_cols = [[] for i in range(9)]
         self.cell_boxes = [[] for i in range(9)]
+        # values placed in the 9 rows, 9 cols and 9 boxes as bit masks, and how many cells of the unit hold each value
+        self.unit_masks = [0] * 27
+        self.unit_counts = [[0] * 10 for _ in range(27)]
         for row_index, row in enumerate(board.cell_rows):
             cell_row = []
             for col_index, cell in enumerate(row):
@@ -385,7 +388,10 @@ class BackgroundBoardNbN:
                     c_row=cell_row,
                     c_col=self.cell_cols[col_index],
                     c_box=self.cell_boxes[(row_index // 3) * 3 + col_index // 3],
-                    cell=cell)
+                    cell=cell,
+                    units=(row_index, 9 + col_index, 18 + (row_index // 3) * 3 + col_index // 3),
+                    unit_masks=self.unit_masks,
+                    unit_counts=self.unit_counts)
                 cell_row.append(bg_cell)
                 self.cell_cols[col_index].append(bg_cell)
                 self.cell_boxes[(row_index // 3) * 3 + col_index // 3].append(bg_cell)
@@ -435,34 +441,58 @@ class BackgroundBoardNbN:
 
 class BackgroundCell:
 
-    def __init__(self, c_row, c_col, c_box, cell):
+    def __init__(self, c_row, c_col, c_box, cell, units, unit_masks, unit_counts):
         self.c_row = c_row
         self.c_col = c_col
         self.c_box = c_box
+        self.units = units  # the row, col and box numbers of the board's unit masks
+        self.unit_masks = unit_masks
+        self.unit_counts = unit_counts
         self.value = cell.value
         self.isResolved = cell.isResolved
         self.possible_values = {pV for pV in range(1, 10)}
+        if self.value is not None:
+            self.occupy_units()
 
     def reduce_possible_values(self, values):
         self.possible_values -= values
         if len(self.possible_values) == 1:
+            if self.value is not None:
+                self.vacate_units()
             self.value = list(self.possible_values)[0]
             self.isResolved = True
+            self.occupy_units()
 
     def clear_value(self):
+        if self.value is not None:
+            self.vacate_units()
         self.value = None
         self.isResolved = False
         self.possible_values = {pV for pV in range(1, 10)}
 
     def set_value(self, value):
+        if self.value is not None:
+            self.vacate_units()
         self.value = value
         self.isResolved = True
         self.possible_values = {value}
+        self.occupy_units()
 
     def isValid(self, value):
         """returns True if the digit is valid"""
-        return not any(
-            value in lst for lst in [[cell.value for cell in self.c_row],
-                                     [cell.value for cell in self.c_col],
-                                     [cell.value for cell in self.c_box]]
-        )
+        unit_masks = self.unit_masks
+        value_bit = 1 << (value - 1)
+        return not (unit_masks[self.units[0]] | unit_masks[self.units[1]] | unit_masks[self.units[2]]) & value_bit
+
+    def occupy_units(self):
+        """marks the cell's value as placed in its row, col and box"""
+        for u in self.units:
+            self.unit_masks[u] |= 1 << (self.value - 1)
+            self.unit_counts[u][self.value] += 1
+
+    def vacate_units(self):
+        """unmarks the cell's value in its row, col and box, unless another cell of the unit still holds it"""
+        for u in self.units:
+            self.unit_counts[u][self.value] -= 1
+            if not self.unit_counts[u][self.value]:
+                self.unit_masks[u] &= ~(1 << (self.value - 1))
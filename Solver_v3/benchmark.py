@@ -0,0 +1,182 @@
+"""
+Headless benchmark of every Algorithm.SOLVING mode.
+The corpus holds seeded puzzles per Difficulty (the buckets of get_difficulty_range) and gets written to a JSON file
+on the first run, so every later run solves the same puzzles. EXTREME is best effort: the generator stops once no
+more clues can go without losing uniqueness, which is usually above the 19 - 23 givens of the range (the stored
+corpus has 24 - 26), so every bucket reports the given counts its puzzles really have.
+Per mode and bucket the report holds the wall time percentiles, recursions_checked, constellations_checked and the
+peak traced memory. It is written as JSON and can be compared against a stored baseline.
+
+    python -m Solver_v3.benchmark --output bench.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import sys
+import time
+import tracemalloc
+
+from Solver_v3.core import Algorithm, BackgroundBoardNbN, BackgroundGenerator, BackgroundSolver, Difficulty
+
+DIFFICULTIES = (Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD, Difficulty.EXTREME)
+DEFAULT_CORPUS_PATH = os.path.join(os.path.dirname(__file__), "benchmark_corpus.json")
+
+
+class SolveTimeout(Exception):
+    pass
+
+
+def load_corpus(path=DEFAULT_CORPUS_PATH, puzzles_per_difficulty=10, seed=0):
+    """returns {difficulty name: [81 char puzzle strings]}, the corpus gets generated and saved if path doesn't exist"""
+    if os.path.exists(path):
+        with open(path) as file:
+            return json.load(file)
+    random.seed(seed)
+    bg_generator = BackgroundGenerator()
+    corpus = {}
+    for difficulty in DIFFICULTIES:
+        corpus[difficulty.name] = [
+            "".join(str(value or 0)
+                    for row in bg_generator.generate(difficulty=difficulty).get_values() for value in row)
+            for _ in range(puzzles_per_difficulty)]
+    with open(path, "w") as file:
+        json.dump(corpus, file, indent=2)
+    return corpus
+
+
+def percentile(values, p):
+    """nearest rank percentile of a non empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+def _solve(puzzle, algorithm):
+    bg_board = BackgroundBoardNbN.from_values([[int(ch) for ch in puzzle[r * 9:r * 9 + 9]] for r in range(9)])
+    bg_solver = BackgroundSolver(bg_board=bg_board)
+    isSolved = bg_solver.solve(algorithm=algorithm)
+    return isSolved, bg_solver
+
+
+def _raise_timeout(signum, frame):
+    raise SolveTimeout
+
+
+def run_benchmark(corpus, algorithms=tuple(Algorithm.SOLVING), timeout=5.0, measure_memory=True):
+    """
+    solves every puzzle of the corpus with every algorithm. A solve running longer than timeout seconds gets stopped
+    and counted as a timeout (only where signal.setitimer exists). Returns the results as a JSON ready dict
+    """
+    canTimeout = timeout and hasattr(signal, "setitimer")
+    if canTimeout:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+    results = {}
+    for algorithm in algorithms:
+        results[algorithm.name] = {}
+        for difficulty, puzzles in corpus.items():
+            finished = []
+            times = []
+            recursions = []
+            constellations = []
+            solved = 0
+            timeouts = 0
+            for puzzle in puzzles:
+                start = time.perf_counter()
+                try:
+                    if canTimeout:
+                        signal.setitimer(signal.ITIMER_REAL, timeout)
+                    isSolved, bg_solver = _solve(puzzle, algorithm)
+                except SolveTimeout:
+                    timeouts += 1
+                    continue
+                finally:
+                    if canTimeout:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+                times.append(time.perf_counter() - start)
+                finished.append(puzzle)
+                recursions.append(bg_solver.recursions_checked)
+                constellations.append(bg_solver.constellations_checked)
+                solved += isSolved
+            givens = [sum(ch != "0" for ch in puzzle) for puzzle in puzzles]
+            bucket = {"puzzles": len(puzzles), "givens_min": min(givens), "givens_max": max(givens), "solved": solved,
+                      "timeouts": timeouts}
+            if times:
+                bucket.update({
+                    "time_p50": percentile(times, 50),
+                    "time_p90": percentile(times, 90),
+                    "time_p99": percentile(times, 99),
+                    "time_max": max(times),
+                    "recursions_checked_mean": sum(recursions) / len(recursions),
+                    "recursions_checked_max": max(recursions),
+                    "constellations_checked_mean": sum(constellations) / len(constellations),
+                })
+                if measure_memory:  # a separate pass, tracing slows everything down and would skew the times
+                    tracemalloc.start()
+                    for puzzle in finished:
+                        _solve(puzzle, algorithm)
+                    bucket["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+            results[algorithm.name][difficulty] = bucket
+            print(f"{algorithm.name:<40} {difficulty:<8} {bucket.get('time_p50', float('nan')):9.4f}s p50 "
+                  f"{bucket.get('recursions_checked_mean', 0):10.1f} recursions  {solved}/{len(puzzles)} solved"
+                  f"{f'  {timeouts} timeouts' if timeouts else ''}")
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    returns a list of regressions: buckets whose p50 time grew by more than tolerance, whose mean node count grew or
+    that solve fewer puzzles than in the baseline
+    """
+    regressions = []
+    for algorithm_name, buckets in results.items():
+        for difficulty, bucket in buckets.items():
+            base = baseline.get(algorithm_name, {}).get(difficulty)
+            if base is None:
+                continue
+            if bucket["solved"] < base["solved"]:
+                regressions.append(f"{algorithm_name} {difficulty}: solved {bucket['solved']} < {base['solved']}")
+            if "time_p50" in bucket and "time_p50" in base and \
+                    bucket["time_p50"] > base["time_p50"] * (1 + tolerance):
+                regressions.append(f"{algorithm_name} {difficulty}: p50 {bucket['time_p50']:.4f}s > "
+                                   f"{base['time_p50']:.4f}s")
+            if bucket.get("recursions_checked_mean", 0) > base.get("recursions_checked_mean", float("inf")):
+                regressions.append(f"{algorithm_name} {difficulty}: recursions_checked "
+                                   f"{bucket['recursions_checked_mean']:.1f} > {base['recursions_checked_mean']:.1f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmarks every Algorithm.SOLVING mode")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_PATH)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also writes the results to --baseline")
+    parser.add_argument("--algorithms", nargs="*", help="names of the Algorithm.SOLVING modes to run, all by default")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds per solve, 0 for none")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p50 time growth")
+    parser.add_argument("--no-memory", action="store_true", help="skips the tracemalloc pass")
+    args = parser.parse_args(argv)
+    if args.baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"baseline {args.baseline} doesn't exist, --save-baseline creates it")
+
+    corpus = load_corpus(args.corpus)
+    algorithms = [Algorithm.SOLVING[name] for name in args.algorithms] if args.algorithms else list(Algorithm.SOLVING)
+    results = run_benchmark(corpus, algorithms=algorithms, timeout=args.timeout, measure_memory=not args.no_memory)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+    elif args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_to_baseline(results, json.load(file), tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
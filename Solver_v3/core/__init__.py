@@ -0,0 +1,13 @@
+"""
+GUI free solver core: the board model, the solving algorithms of Algorithm.SOLVING and the generator.
+Nothing in here may import customtkinter, tensorflow or any other GUI / ML package.
+"""
+from Solver_v3.core.enums import SolveType, Difficulty, CellChange, BoardType, Algorithm, get_difficulty_range, \
+    get_box_shape
+from Solver_v3.core.tables import BoardGeometry, get_geometry
+from Solver_v3.core.board import BackgroundBoardNbN, BackgroundCell
+from Solver_v3.core.solver import BackgroundSolver
+from Solver_v3.core.generator import BackgroundGenerator
+from Solver_v3.core.rating import BackgroundRater
+from Solver_v3.core.dancing_links import DancingLinks
+from Solver_v3.core.metrics import Metrics, Profiler, Profiled
@@ -0,0 +1,106 @@
+"""
+Batch solving of many 9x9 boards at once with NumPy.
+The candidates of N boards are held as an (N, 81) uint16 array of pV_masks (bit d - 1 stands for digit d, cells row
+by row like BackgroundBoardNbN.cells). Naked and hidden singles run vectorized over all boards, only the boards they
+can't finish go through a BackgroundSolver one by one.
+This is the only core module that imports NumPy, Solver_v3.core itself stays free of it.
+"""
+import numpy as np
+
+from Solver_v3.core.bitmask import ALL_DIGITS, POPCOUNT, SINGLE_DIGIT
+from Solver_v3.core.board import BackgroundBoardNbN
+from Solver_v3.core.enums import Algorithm
+from Solver_v3.core.solver import BackgroundSolver
+from Solver_v3.core.tables import UNITS, PEERS
+
+PEER_INDEX = np.array(PEERS, dtype=np.intp)  # (81, 20)
+UNIT_INDEX = np.array(UNITS, dtype=np.intp)  # (27, 9)
+POPCOUNT_TABLE = np.array(POPCOUNT, dtype=np.uint8)
+SINGLE_DIGIT_TABLE = np.array(SINGLE_DIGIT, dtype=np.uint8)
+DIGIT_BITS = np.array([1 << d for d in range(9)], dtype=np.uint16)
+
+
+def candidates_from_values(values):
+    """values is an (N, 9, 9) or (N, 81) array of digits, empty cells 0. Returns the (N, 81) uint16 candidates"""
+    values = np.asarray(values, dtype=np.uint16).reshape(-1, 81)
+    return np.where(values > 0, np.left_shift(1, np.maximum(values, 1) - 1), ALL_DIGITS).astype(np.uint16)
+
+
+def values_from_candidates(candidates):
+    """returns the (N, 9, 9) uint8 values of (N, 81) candidates, cells with more or less than one candidate are 0"""
+    return SINGLE_DIGIT_TABLE[candidates].reshape(-1, 9, 9)
+
+
+def propagate(candidates):
+    """
+    runs naked and hidden singles on all boards until none of them changes anymore. candidates gets reduced in
+    place, returns an (N,) bool array of the boards that ran into a contradiction (a cell without candidates, a value
+    twice in a unit or a value that fits nowhere in a unit)
+    """
+    isContradicted = np.zeros(len(candidates), dtype=bool)
+    active = np.arange(len(candidates))
+    while len(active):
+        board_candidates = candidates[active]
+        # naked singles: placed values leave their peers
+        isPlaced = POPCOUNT_TABLE[board_candidates] == 1
+        placed_bits = np.where(isPlaced, board_candidates, 0).astype(np.uint16)
+        peer_bits = np.bitwise_or.reduce(placed_bits[:, PEER_INDEX], axis=2)
+        isDead = (placed_bits & peer_bits).any(axis=1)
+        reduced = np.where(isPlaced, board_candidates, board_candidates & ~peer_bits).astype(np.uint16)
+        # hidden singles: a value with one position left in a unit goes there
+        unit_digits = ((reduced[:, :, None] & DIGIT_BITS) != 0)[:, UNIT_INDEX]  # (n, 27, 9 positions, 9 digits)
+        position_counts = unit_digits.sum(axis=2)
+        isDead |= (position_counts == 0).any(axis=(1, 2))
+        board_index, unit_index, position, digit = np.nonzero(unit_digits & (position_counts == 1)[:, :, None, :])
+        reduced[board_index, UNIT_INDEX[unit_index, position]] = DIGIT_BITS[digit]
+        isDead |= (reduced == 0).any(axis=1)
+        isChanged = (reduced != board_candidates).any(axis=1)
+        candidates[active] = reduced
+        isContradicted[active] |= isDead
+        active = active[isChanged & ~isDead]
+    return isContradicted
+
+
+class BatchSolver:
+
+    def __init__(self, algorithm=Algorithm.SOLVING.DANCING_LINKS, chunk_size=10000):
+        """
+        algorithm is what the boards left over by the singles get solved with. chunk_size boards get propagated at
+        once, which bounds the memory of the intermediate arrays
+        """
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+        self.boards_solved_by_propagation = 0
+        self.boards_searched = 0
+        self.boards_unsolvable = 0
+
+    def solve(self, puzzles):
+        """
+        puzzles is an (N, 9, 9) or (N, 81) array of digits like BackgroundBoardNbN.get_values with 0 for empty cells.
+        Returns the solutions as an (N, 9, 9) uint8 array, boards without a solution stay all 0
+        """
+        values = np.asarray(puzzles, dtype=np.uint8).reshape(-1, 81)
+        solutions = np.zeros((len(values), 9, 9), dtype=np.uint8)
+        for start in range(0, len(values), self.chunk_size):
+            candidates = candidates_from_values(values[start:start + self.chunk_size])
+            isContradicted = propagate(candidates)
+            isSolved = (POPCOUNT_TABLE[candidates] == 1).all(axis=1) & ~isContradicted
+            chunk_solutions = solutions[start:start + self.chunk_size]
+            chunk_solutions[isSolved] = values_from_candidates(candidates[isSolved])
+            self.boards_solved_by_propagation += int(isSolved.sum())
+            self.boards_unsolvable += int(isContradicted.sum())
+            for i in np.nonzero(~isSolved & ~isContradicted)[0]:
+                solution = self.search(SINGLE_DIGIT_TABLE[candidates[i]].reshape(9, 9))
+                if solution is None:
+                    self.boards_unsolvable += 1
+                else:
+                    chunk_solutions[i] = solution
+        return solutions
+
+    def search(self, values):
+        """solves a single (9, 9) board with self.algorithm, returns the solution as a nested list or None"""
+        self.boards_searched += 1
+        bg_board = BackgroundBoardNbN.from_values(values.tolist())
+        if not BackgroundSolver(bg_board=bg_board).solve(algorithm=self.algorithm):
+            return None
+        return bg_board.get_values()
@@ -0,0 +1,62 @@
+"""
+Lookup tables for 9-bit candidate masks.
+Bit (d - 1) of a mask is set when the digit d is still a possible value of a cell. Boards up to 25x25 use masks of
+up to 25 bits, the tables only cover 9 bits, so code that runs on every board size goes through get_mask_digits and
+get_subsets, which fall back to computing what the tables don't hold.
+"""
+from functools import lru_cache
+from itertools import combinations
+
+ALL_DIGITS = 0b111111111
+MAX_SIZE = 25  # digits of the biggest board
+
+# DIGIT_BIT[d] is the mask that only contains digit d, DIGIT_BIT[0] is kept empty so a missing value reduces nothing
+DIGIT_BIT = tuple(0 if d == 0 else 1 << (d - 1) for d in range(MAX_SIZE + 1))
+
+# POPCOUNT[mask] is the amount of possible values in the mask
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(512))
+
+# SINGLE_DIGIT[mask] is the digit of a mask containing exactly one possible value, 0 otherwise
+SINGLE_DIGIT = tuple(mask.bit_length() if POPCOUNT[mask] == 1 else 0 for mask in range(512))
+
+# MASK_DIGITS[mask] is a tuple of all digits in the mask in ascending order
+MASK_DIGITS = tuple(tuple(d for d in range(1, 10) if mask & DIGIT_BIT[d]) for mask in range(512))
+
+
+# CHUNK_DIGITS[k][chunk] is MASK_DIGITS[chunk] moved up to the digits of bits 9k - (9k + 8), for the wide masks
+CHUNK_DIGITS = tuple(tuple(tuple(9 * k + d for d in MASK_DIGITS[chunk]) for chunk in range(512)) for k in range(3))
+
+
+def get_mask_digits(mask):
+    """MASK_DIGITS[mask] for masks of up to 27 bits, wider masks get looked up 9 bits at a time"""
+    if mask < 512:
+        return MASK_DIGITS[mask]
+    return CHUNK_DIGITS[0][mask & 0o777] + CHUNK_DIGITS[1][mask >> 9 & 0o777] + CHUNK_DIGITS[2][mask >> 18]
+
+
+def mask_from_values(values):
+    """returns the mask of an iterable of digits"""
+    mask = 0
+    for value in values:
+        mask |= DIGIT_BIT[value]
+    return mask
+
+
+def values_from_mask(mask):
+    """returns the digits of a mask as a set"""
+    return set(get_mask_digits(mask))
+
+# SUBSETS[n][k] holds (subset_mask, indices) for every subset of k out of n positions, bit i stands for position i
+SUBSETS = tuple(
+    tuple(
+        tuple((mask, tuple(i for i in range(n) if mask >> i & 1)) for mask in range(1 << n) if POPCOUNT[mask] == k)
+        for k in range(n + 1))
+    for n in range(10))
+
+
+@lru_cache(maxsize=None)
+def get_subsets(n, k):
+    """SUBSETS[n][k] for any n, the subsets of more than 9 positions get built on first use"""
+    if n < len(SUBSETS):
+        return SUBSETS[n][k]
+    return tuple((sum(1 << i for i in indices), indices) for indices in combinations(range(n), k))
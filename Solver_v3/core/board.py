@@ -0,0 +1,308 @@
+import copy
+
+from Solver_v3.core.bitmask import DIGIT_BIT, get_mask_digits, mask_from_values, values_from_mask
+from Solver_v3.core.dancing_links import DancingLinks
+from Solver_v3.core.enums import BoardType
+from Solver_v3.core.tables import NINE_X_NINE, get_geometry
+
+
+def get_digit_positions(cells):
+    """
+    digit side view of a row, col or box: returns a list where index d holds a mask of the positions d can still go
+    to, bit i stands for cells[i]. Resolved cells count as the only position of their value
+    """
+    positions = [0] * len(DIGIT_BIT)
+    for i, cell in enumerate(cells):
+        for digit in get_mask_digits(cell.pV_mask):
+            positions[digit] |= 1 << i
+    return positions
+
+
+class BackgroundBoardNbN:
+
+    def __init__(self, board=None, board_type=None):
+        """
+        board is the board to copy, anything with 'cell_rows' of cells that have a value, isUnresolved and
+        possible_values works (e.g. the GUI's Board9x9). Without a board an empty board gets created.
+        board_type defaults to the board's board_type and to BoardType.NINE_X_NINE without one.
+        """
+        self.og_board = board
+        self.board_type = board_type or getattr(board, "board_type", None) or BoardType.NINE_X_NINE
+        self.geometry = geometry = get_geometry(self.board_type)
+        self.size = geometry.size
+        self.trail = []  # (cell, pV_mask, value, isResolved) before every change, shared with all cells
+        # values placed in every row, col and box (unit numbers of the index tables)
+        self.unit_masks = [0] * len(geometry.units)
+        # unit_counts[u][d] counts the cells of unit u holding d, so clearing a cell knows if its value stays placed
+        self.unit_counts = [[0] * (geometry.size + 1) for _ in geometry.units]
+        self.cell_rows = [[] for _ in geometry.rows]
+        self.cell_cols = [[] for _ in geometry.cols]
+        self.cell_boxes = [[] for _ in geometry.boxes]
+        self.cells = [
+            BackgroundCell(
+                index=i,
+                geometry=geometry,
+                cell=board.cell_rows[geometry.row_of[i]][geometry.col_of[i]] if board is not None else None,
+                trail=self.trail,
+                unit_masks=self.unit_masks,
+                unit_counts=self.unit_counts)
+            for i in range(geometry.cell_count)]
+        for cell_lists, units in ((self.cell_rows, geometry.rows), (self.cell_cols, geometry.cols),
+                                  (self.cell_boxes, geometry.boxes)):
+            for cell_list, unit in zip(cell_lists, units):
+                cell_list.extend(self.cells[i] for i in unit)
+        self.units = self.cell_rows + self.cell_cols + self.cell_boxes
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        values is an n x n nested list like the output of print_board, empty cells are None or 0. The board type
+        follows from n
+        """
+        bg_board = cls(board_type=BoardType(len(values)))
+        bg_board.load_values(values)
+        return bg_board
+
+    def load_values(self, values):
+        """clears the board and places the values of an n x n nested list, empty cells are None or 0"""
+        self.clear_bg_board()
+        for bg_row, row in zip(self.cell_rows, values):
+            for bg_cell, value in zip(bg_row, row):
+                if value:
+                    bg_cell.set_value(int(value))
+
+    @property
+    def isSolved(self):
+        cells = self.cells
+        # checks if the board has any unresolved values left
+        if not all(c.isResolved for c in cells):
+            return False
+        # checks if every row, col and box holds every value, so no value can appear twice in one of them
+        all_digits = self.geometry.all_digits
+        for unit in self.geometry.units:
+            unit_mask = 0
+            for i in unit:
+                unit_mask |= DIGIT_BIT[cells[i].value]
+            if unit_mask != all_digits:
+                return False
+        return True
+
+    @property
+    def isUniquelySolvable(self):
+        return self.count_solutions(limit=2) == 1
+
+    @property
+    def isSolvableByElimination(self):
+        """whether the eliminations alone finish the board, the board itself stays untouched"""
+        from Solver_v3.core.solver import BackgroundSolver  # solver.py imports this module
+        checkpoint = self.checkpoint()
+        isSolvable = BackgroundSolver(bg_board=self).check_if_bg_board_is_uniquely_solvable(bg_board=self)
+        self.undo(checkpoint)
+        return isSolvable
+
+    def is_resolvable_by_singles(self, cell=None):
+        """
+        whether naked and hidden singles resolve the cell (finish the board without a cell), the board itself stays
+        untouched. The singles stop as soon as the cell is resolved: on a board the singles finish, a cleared cell they
+        bring back means they finish the board without it too
+        """
+        from Solver_v3.core.solver import BackgroundSolver  # solver.py imports this module
+        checkpoint = self.checkpoint()
+        bg_solver = BackgroundSolver(bg_board=self)
+        isResolvable = False
+        for _ in bg_solver.iter_propagation(unit_reductions=(bg_solver.reduction_by_sudoku_set,
+                                                             bg_solver.reduction_by_hidden_singles_set)):
+            if cell is not None and cell.isResolved:
+                isResolvable = True
+                break
+        else:
+            isResolvable = self.isSolved
+        self.undo(checkpoint)
+        return isResolvable
+
+    def checkpoint(self):
+        """returns a marker of the current state, undo(checkpoint) brings the board back to it"""
+        return len(self.trail)
+
+    def undo(self, checkpoint):
+        """pops every change made since the checkpoint off the trail, newest first"""
+        trail = self.trail
+        while len(trail) > checkpoint:
+            cell, pV_mask, value, isResolved = trail.pop()
+            if cell.isResolved:
+                cell.vacate_units()
+            cell.pV_mask = pV_mask
+            cell.value = value
+            cell.isResolved = isResolved
+            if isResolved:
+                cell.occupy_units()
+
+    def is_valid(self, index, value):
+        """returns True if none of the row, col and box of cell index holds the value yet"""
+        unit_masks = self.unit_masks
+        row, col, box = self.geometry.cell_units[index]
+        return not (unit_masks[row] | unit_masks[col] | unit_masks[box]) & DIGIT_BIT[value]
+
+    def clear_trail(self):
+        """forgets the recorded changes, older checkpoints can't be undone afterwards"""
+        self.trail.clear()
+
+    def count_solutions(self, limit=2):
+        """
+        counts the solutions of the board without changing it. The search stops as soon as limit solutions are found,
+        so the default only tells apart no, exactly one and more than one solution
+        """
+        return DancingLinks(self.get_values()).count_solutions(limit=limit)
+
+    def clear_bg_board(self):
+        for c in self.cells:
+            c.clear_value()
+        self.clear_trail()
+
+    def print_board(self):
+        for row in self.cell_rows:
+            print([cell.value for cell in row])
+
+    def get_values(self):
+        """returns the board as an n x n nested list, unresolved cells are None"""
+        return [[cell.value if cell.isResolved else None for cell in row] for row in self.cell_rows]
+
+    def get_digit_plane(self, digit):
+        """
+        returns an n * n bit mask of the cells that hold or can still hold the digit, bit n * row + col.
+        Resolved cells stay in the plane so a line that already has the digit never looks like it still needs it
+        """
+        plane = 0
+        bit = DIGIT_BIT[digit]
+        for i, cell in enumerate(self.cells):
+            if cell.pV_mask & bit:
+                plane |= 1 << i
+        return plane
+
+    def get_unresolved_cells(self):
+        unresolved_cells = []
+        for row in self.cell_rows:
+            for cell in row:
+                if not cell.isResolved:
+                    unresolved_cells.append(cell)
+        return unresolved_cells
+
+    def solve_alg_backtracking(self):
+        """try all possible values"""
+        unresolved_cells = self.get_unresolved_cells()
+        for unresolved_cell in unresolved_cells:
+            for num in get_mask_digits(unresolved_cell.pV_mask):
+                if self.is_valid(unresolved_cell.index, num):
+                    checkpoint = self.checkpoint()
+                    unresolved_cell.set_value(num)
+                    if self.solve_alg_backtracking():
+                        return True
+                    self.undo(checkpoint)
+            return False
+        return True
+
+    def print_back_to_og_board(self):
+        for row_index, og_row in enumerate(self.og_board.cell_rows):
+            for col_index, og_cell in enumerate(og_row):
+                if self.cell_rows[row_index][col_index].isResolved and not self.og_board.cell_rows[row_index][
+                    col_index].isGiven:
+                    og_cell.set_resolved_value(value=self.cell_rows[row_index][col_index].value)
+
+    def print_cells_back_to_og_board(self, cells):
+        """prints the values and possible values of the passed in cells back to their cells on the og board"""
+        for cell in cells:
+            og_cell = self.og_board.cell_rows[self.geometry.row_of[cell.index]][self.geometry.col_of[cell.index]]
+            if og_cell.isGiven:
+                continue
+            if cell.isResolved:
+                og_cell.set_resolved_value(value=cell.value)
+            else:
+                og_cell.reduce_possible_values(og_cell.possible_values - set(cell.possible_values))
+
+    def print_back_to_og_board_as_given(self):
+        for row_index, og_row in enumerate(self.og_board.cell_rows):
+            for col_index, og_cell in enumerate(og_row):
+                if self.cell_rows[row_index][col_index].isResolved:
+                    og_cell.set_given_value(value=self.cell_rows[row_index][col_index].value)
+
+
+class BackgroundCell:
+
+    def __init__(self, index, geometry=None, cell=None, trail=None, unit_masks=None, unit_counts=None):
+        self.index = index  # position in the index tables, n * row + col
+        geometry = geometry or NINE_X_NINE
+        self.all_digits = geometry.all_digits
+        self.trail = trail if trail is not None else []  # every change gets recorded here so it can be undone
+        # the board's unit masks and which of them belong to this cell, every placed value gets marked in them
+        self.unit_masks = unit_masks if unit_masks is not None else [0] * len(geometry.units)
+        self.unit_counts = unit_counts if unit_counts is not None else [[0] * (geometry.size + 1)
+                                                                        for _ in geometry.units]
+        self.units = geometry.cell_units[index]
+        if cell is None:
+            self.value = None
+            self.isResolved = False
+            self.pV_mask = self.all_digits
+        else:
+            self.value = copy.deepcopy(cell.value)
+            self.isResolved = False if cell.isUnresolved else True
+            self.pV_mask = mask_from_values(cell.possible_values)  # bit (d - 1) is set while d is a possible value
+            if self.isResolved:
+                self.occupy_units()
+
+    @property
+    def possible_values(self):
+        return values_from_mask(self.pV_mask)
+
+    def reduce_possible_values(self, pV_mask):
+        """removes every digit in the passed in mask from the possible values"""
+        if not self.pV_mask & pV_mask and (self.isResolved or self.pV_mask.bit_count() != 1):
+            return  # nothing would change, so nothing gets recorded
+        self.trail.append((self, self.pV_mask, self.value, self.isResolved))
+        self.pV_mask &= ~pV_mask
+        if self.pV_mask.bit_count() == 1:
+            if self.isResolved:
+                self.vacate_units()
+            self.value = self.pV_mask.bit_length()
+            self.isResolved = True
+            self.occupy_units()
+
+    def clear_value(self):
+        self.trail.append((self, self.pV_mask, self.value, self.isResolved))
+        if self.isResolved:
+            self.vacate_units()
+        self.value = None
+        self.isResolved = False
+        self.pV_mask = self.all_digits
+
+    def set_value(self, value):
+        self.trail.append((self, self.pV_mask, self.value, self.isResolved))
+        if self.isResolved:
+            self.vacate_units()
+        self.value = value
+        self.isResolved = True
+        self.pV_mask = DIGIT_BIT[value]
+        self.occupy_units()
+
+    def is_valid(self, value):
+        """returns True if the digit is valid"""
+        unit_masks = self.unit_masks
+        return not any(unit_masks[u] & DIGIT_BIT[value] for u in self.units)
+
+    def occupy_units(self):
+        """marks the cell's value as placed in its row, col and box"""
+        value_bit = DIGIT_BIT[self.value]
+        for u in self.units:
+            self.unit_masks[u] |= value_bit
+            self.unit_counts[u][self.value] += 1
+
+    def vacate_units(self):
+        """
+        unmarks the cell's value in its row, col and box. A unit keeps the mark if another cell in it holds the same
+        value, which only happens on a contradicted board
+        """
+        value_bit = DIGIT_BIT[self.value]
+        for u in self.units:
+            unit_counts = self.unit_counts[u]
+            unit_counts[self.value] -= 1
+            if not unit_counts[self.value]:
+                self.unit_masks[u] &= ~value_bit
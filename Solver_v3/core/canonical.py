@@ -0,0 +1,127 @@
+"""
+Canonical forms of 9x9 puzzles and a solution cache keyed on them.
+Transposing, swapping bands / stacks, swapping rows / cols inside a band / stack and relabeling the digits turn a
+puzzle into an equivalent one. canonicalize orders the lines by how many givens they and their crossing lines hold
+and relabels the digits in reading order, then keeps the smallest string over the orders of lines that tie. That maps
+most equivalent puzzles onto the same string without the cost of a full minlex search. Puzzles with too many ties may
+miss their class, but every transform is a real symmetry, so the cached solutions always map back correctly.
+"""
+from collections import OrderedDict
+from itertools import groupby, permutations, product
+
+from Solver_v3.core.enums import Algorithm
+from Solver_v3.core.solver import BackgroundSolver
+
+
+def canonicalize(values, max_orders=16):
+    """
+    values is a 9x9 nested list, empty cells are None or 0. Returns (canonical, cell_order, digit_map): canonical is
+    the 81 char string of the canonical puzzle ('0' for empty cells), its cell i is cell cell_order[i] (9 * row + col)
+    of values and digit_map[d] is the canonical digit of d. Lines with the same key get tried in every order, up to
+    max_orders row orders and col orders per transposition, and the smallest string wins
+    """
+    flat = [int(value) if value else 0 for row in values for value in row]
+    best = None
+    for isTransposed in (False, True):
+        source = [(i % 9) * 9 + i // 9 for i in range(81)] if isTransposed else list(range(81))
+        grid = [flat[i] for i in source]
+        col_orders = _get_line_orders(grid, isRow=False, max_orders=max_orders)
+        for row_order in _get_line_orders(grid, isRow=True, max_orders=max_orders):
+            for col_order in col_orders:
+                cell_order = tuple(source[9 * r + c] for r in row_order for c in col_order)
+                digit_map = [0] * 10
+                next_digit = 1
+                for i in cell_order:
+                    if flat[i] and not digit_map[flat[i]]:
+                        digit_map[flat[i]] = next_digit
+                        next_digit += 1
+                canonical = "".join(str(digit_map[flat[i]]) for i in cell_order)
+                if best is None or canonical < best[0]:
+                    for digit in range(1, 10):  # digits missing from the puzzle still need a label for the solution
+                        if not digit_map[digit]:
+                            digit_map[digit] = next_digit
+                            next_digit += 1
+                    best = (canonical, cell_order, tuple(digit_map))
+    return best
+
+
+def _get_line_orders(grid, isRow, max_orders):
+    """
+    returns up to max_orders orders of the 9 rows (cols) of the grid, band (stack) by band with emptier lines and bands
+    first. A line's key is its given count and the given counts of the lines crossing it at its givens, lines and
+    bands with the same key take every order among each other
+    """
+    line_counts = [0] * 9
+    cross_counts = [0] * 9
+    for i, value in enumerate(grid):
+        if value:
+            line_counts[i // 9 if isRow else i % 9] += 1
+            cross_counts[i % 9 if isRow else i // 9] += 1
+    line_keys = []
+    for line in range(9):
+        cells = [9 * line + k if isRow else 9 * k + line for k in range(9)]
+        crossing = sorted(cross_counts[i % 9 if isRow else i // 9] for i in cells if grid[i])
+        line_keys.append((line_counts[line], tuple(crossing)))
+    band_keys = [tuple(sorted(line_keys[band * 3:band * 3 + 3])) for band in range(3)]
+    orders = []
+    for band_order in _get_tie_orders(range(3), key=band_keys.__getitem__):
+        line_orders = [_get_tie_orders(range(band * 3, band * 3 + 3), key=line_keys.__getitem__)
+                       for band in band_order]
+        for lines in product(*line_orders):
+            orders.append([line for band_lines in lines for line in band_lines])
+            if len(orders) >= max_orders:
+                return orders
+    return orders
+
+
+def _get_tie_orders(items, key):
+    """returns every order of the items sorted by key, items with the same key take all orders among each other"""
+    groups = [list(group) for _, group in groupby(sorted(items, key=key), key=key)]
+    return [tuple(item for group in groups_order for item in group)
+            for groups_order in product(*(permutations(group) for group in groups))]
+
+
+def uncanonicalize(canonical_solution, cell_order, digit_map):
+    """maps an 81 char solution of the canonical puzzle back onto the original puzzle, returns a 9x9 nested list"""
+    inverse_digit_map = [0] * 10
+    for digit, canonical_digit in enumerate(digit_map):
+        inverse_digit_map[canonical_digit] = digit
+    flat = [0] * 81
+    for i, ch in enumerate(canonical_solution):
+        flat[cell_order[i]] = inverse_digit_map[int(ch)]
+    return [flat[row_index * 9:row_index * 9 + 9] for row_index in range(9)]
+
+
+class SolutionCache:
+
+    def __init__(self, maxsize=4096):
+        """keeps the solutions of the maxsize most recently used canonical puzzles"""
+        self.maxsize = maxsize
+        self.solutions = OrderedDict()  # canonical puzzle -> canonical solution, None for puzzles without one
+        self.hits = 0
+        self.misses = 0
+
+    def solve(self, values, bg_solver=None, algorithm=Algorithm.SOLVING.DANCING_LINKS):
+        """
+        returns the solution of the 9x9 nested list as a 9x9 nested list or None if it has none. Only puzzles whose
+        canonical form isn't cached yet get solved, by bg_solver (a new BackgroundSolver by default) with algorithm
+        """
+        canonical, cell_order, digit_map = canonicalize(values)
+        if canonical in self.solutions:
+            self.hits += 1
+            self.solutions.move_to_end(canonical)
+            canonical_solution = self.solutions[canonical]
+        else:
+            self.misses += 1
+            bg_solver = bg_solver if bg_solver is not None else BackgroundSolver()
+            bg_solver.bg_board.load_values([[int(ch) for ch in canonical[row_index * 9:row_index * 9 + 9]]
+                                             for row_index in range(9)])
+            canonical_solution = None
+            if bg_solver.solve(algorithm=algorithm):
+                canonical_solution = "".join(str(c.value) for c in bg_solver.bg_board.cells)
+            self.solutions[canonical] = canonical_solution
+            if len(self.solutions) > self.maxsize:
+                self.solutions.popitem(last=False)
+        if canonical_solution is None:
+            return None
+        return uncanonicalize(canonical_solution, cell_order, digit_map)
@@ -0,0 +1,186 @@
+"""
+Knuth's Algorithm X on dancing links for the exact cover form of an n x n sudoku.
+The matrix has n ** 3 rows, one per (row, col, digit) placement, and 4 * n ** 2 constraint columns:
+every cell holds a digit, every row / col / box holds every digit once. For the 9x9 board that is 729 rows and
+324 columns.
+The links are kept in flat lists (node index -> left, right, up, down, column) instead of node objects.
+"""
+from Solver_v3.core.enums import BoardType
+from Solver_v3.core.tables import get_geometry
+
+
+def get_constraint_columns(row_index, col_index, value, geometry):
+    """returns the four constraint columns (1 based, 0 is the root) a placement covers"""
+    n = geometry.size
+    cell_count = geometry.cell_count
+    box_index = geometry.box_of[row_index * n + col_index]
+    return (1 + row_index * n + col_index,
+            1 + cell_count + row_index * n + value - 1,
+            1 + 2 * cell_count + col_index * n + value - 1,
+            1 + 3 * cell_count + box_index * n + value - 1)
+
+
+class DancingLinks:
+
+    def __init__(self, values):
+        """
+        values is an n x n nested list like BackgroundBoardNbN.get_values, empty cells are None or 0. The box shape
+        is the one of the BoardType of size n
+        """
+        self.nodes_visited = 0
+        self.isContradicted = False
+        self.solution = []  # indices of the first node of every chosen matrix row
+        self.geometry = geometry = get_geometry(BoardType(len(values)))
+        n = self.size = geometry.size
+        # node 0 is the root, nodes 1 - 4 * n ** 2 are the column headers
+        constraint_count = 4 * geometry.cell_count
+        header_count = constraint_count + 1
+        self.L = [i - 1 for i in range(header_count)]
+        self.R = [i + 1 for i in range(header_count)]
+        self.L[0] = constraint_count
+        self.R[constraint_count] = 0
+        self.U = list(range(header_count))
+        self.D = list(range(header_count))
+        self.C = list(range(header_count))
+        self.S = [0] * header_count
+        self.placement = [None] * header_count  # (row, col, value) of the matrix row a node belongs to
+        placement_nodes = {}
+        for row_index in range(n):
+            for col_index in range(n):
+                for value in range(1, n + 1):
+                    placement_nodes[(row_index, col_index, value)] = self._add_matrix_row(
+                        (row_index, col_index, value))
+        for row_index, row in enumerate(values):
+            for col_index, value in enumerate(row):
+                if value:
+                    self._select_given(placement_nodes[(row_index, col_index, int(value))])
+
+    def _add_matrix_row(self, placement):
+        first = len(self.C)
+        columns = get_constraint_columns(*placement, geometry=self.geometry)
+        for offset, column in enumerate(columns):
+            node = first + offset
+            self.L.append(first + (offset - 1) % 4)
+            self.R.append(first + (offset + 1) % 4)
+            self.U.append(self.U[column])
+            self.D.append(column)
+            self.D[self.U[column]] = node
+            self.U[column] = node
+            self.C.append(column)
+            self.S[column] += 1
+            self.placement.append(placement)
+        return first
+
+    def _select_given(self, first):
+        node = first
+        while True:
+            column = self.C[node]
+            if self.L[self.R[column]] != column:  # column already covered by another given
+                self.isContradicted = True
+                return
+            self._cover(column)
+            node = self.R[node]
+            if node == first:
+                break
+        self.solution.append(first)
+
+    def _cover(self, column):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[column]] = R[column]
+        L[R[column]] = L[column]
+        i = D[column]
+        while i != column:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, column):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[column]
+        while i != column:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[column]] = column
+        L[R[column]] = column
+
+    def _search(self):
+        R, D, C, S = self.R, self.D, self.C, self.S
+        if R[0] == 0:
+            yield self.get_values()
+            return
+        # column size heuristic: branch on the constraint with the fewest remaining options
+        column = R[0]
+        best_column = column
+        while column != 0:
+            if S[column] < S[best_column]:
+                best_column = column
+                if S[column] < 2:
+                    break
+            column = R[column]
+        if S[best_column] == 0:
+            return
+        self._cover(best_column)
+        try:  # the links get restored even if the caller stops iterating early
+            i = D[best_column]
+            while i != best_column:
+                self.nodes_visited += 1
+                self.solution.append(i)
+                j = R[i]
+                while j != i:
+                    self._cover(C[j])
+                    j = R[j]
+                try:
+                    yield from self._search()
+                finally:
+                    j = self.L[i]
+                    while j != i:
+                        self._uncover(C[j])
+                        j = self.L[j]
+                    self.solution.pop()
+                i = D[i]
+        finally:
+            self._uncover(best_column)
+
+    def get_values(self):
+        """returns the current partial solution as an n x n nested list, open cells are None"""
+        values = [[None] * self.size for _ in range(self.size)]
+        for node in self.solution:
+            row_index, col_index, value = self.placement[node]
+            values[row_index][col_index] = value
+        return values
+
+    def iter_solutions(self):
+        """yields every solution as an n x n nested list"""
+        if self.isContradicted:
+            return
+        yield from self._search()
+
+    def solve(self):
+        """returns the first solution as an n x n nested list or None if there is none"""
+        solutions = self.iter_solutions()
+        try:
+            return next(solutions, None)
+        finally:
+            solutions.close()
+
+    def count_solutions(self, limit=None):
+        """counts the solutions, stops as soon as limit solutions are found"""
+        count = 0
+        solutions = self.iter_solutions()
+        try:
+            for _ in solutions:
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        finally:
+            solutions.close()
+        return count
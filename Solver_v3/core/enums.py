@@ -0,0 +1,91 @@
+from enum import Enum
+import random
+
+
+class SolveType(Enum):
+    COMPLETE = "Completely"
+    NEXT_DIGIT = "Until next digit"
+    NEXT_REDUCTION = "Until next reduction"
+
+
+class Difficulty(Enum):
+    EASY = "Easy"
+    MEDIUM = "Medium"
+    HARD = "Hard"
+    EXTREME = "Extreme"
+    EASY_SUDOKU_COM = "Easy from sudoku.com"
+    MEDIUM_SUDOKU_COM = "Medium from sudoku.com"
+    HARD_SUDOKU_COM = "Hard from sudoku.com"
+    EXPERT_SUDOKU_COM = "Expert from sudoku.com"
+    MASTER_SUDOKU_COM = "Master from sudoku.com"
+    EXTREME_SUDOKU_COM = "Extreme from sudoku.com"
+
+
+class CellChange(Enum):
+    UNRESOLVED_TO_RESOLVED = 0
+    UNRESOLVED_TO_GIVEN = 1
+    RESOLVED_TO_UNRESOLVED = 2
+    RESOLVED_TO_GIVEN = 3
+    GIVEN_TO_UNRESOLVED = 4
+    GIVEN_TO_RESOLVED = 5
+
+
+class BoardType(Enum):
+    NINE_X_NINE = 9
+    SIX_X_SIX = 6
+    FOUR_X_FOUR = 4
+    EIGHT_X_EIGHT = 8
+    TWELVE_X_TWELVE = 12
+    SIXTEEN_X_SIXTEEN = 16
+    TWENTY_FIVE_X_TWENTY_FIVE = 25
+
+
+def get_box_shape(board_type: BoardType):
+    """returns (box height, box width) of the board type, the boxes of the non square sizes are wider than high"""
+    match board_type:
+        case BoardType.FOUR_X_FOUR:
+            return 2, 2
+        case BoardType.SIX_X_SIX:
+            return 2, 3
+        case BoardType.EIGHT_X_EIGHT:
+            return 2, 4
+        case BoardType.NINE_X_NINE:
+            return 3, 3
+        case BoardType.TWELVE_X_TWELVE:
+            return 3, 4
+        case BoardType.SIXTEEN_X_SIXTEEN:
+            return 4, 4
+        case BoardType.TWENTY_FIVE_X_TWENTY_FIVE:
+            return 5, 5
+
+
+def get_difficulty_range(diff: Difficulty):
+    match diff:
+        case Difficulty.EASY:
+            return random.randrange(39, 43)
+        case Difficulty.MEDIUM:
+            return random.randrange(34, 38)
+        case Difficulty.HARD:
+            return random.randrange(29, 33)
+        case Difficulty.EXTREME:
+            return random.randrange(19, 23)
+
+
+class Algorithm:
+    class GENERATING(Enum):
+        FILLING = "Filling"
+        REDUCING = "Reducing"
+
+    class CLEARING(Enum):
+        RESETTING = "Resetting"
+        CLEARING = "Clearing"
+
+    class SOLVING(Enum):
+        ELIMINATION_BY_CONSTELLATION = "Elimination by constellation"
+        ELIMINATION_BY_SUDOKU = "Elimination by sudoku"
+        ELIMINATION_OPTIMIZED = "Optimized Elimination"
+        BACKTRACKING = "Backtracking"
+        BACKTRACKING_OPTIMIZED = "Optimized Backtracking"
+        ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING = "Optimized Elimination + Backtracking"
+        BACKTRACKING_MRV = "MRV Backtracking"
+        DANCING_LINKS = "Dancing Links"
@@ -0,0 +1,123 @@
+import random
+
+from Solver_v3.core.board import BackgroundBoardNbN
+from Solver_v3.core.enums import BoardType, Difficulty, get_difficulty_range
+from Solver_v3.core.metrics import Counter, Metrics, Profiled
+from Solver_v3.core.rating import BackgroundRater
+
+
+class BackgroundGenerator(Profiled):
+    PROFILED_TECHNIQUES = ("generate", "fill_board_by_backtracking", "standard_reduction", "check_uniqueness")
+    # the counters live in self.metrics, so subscribers see them grow during a generation
+    recursions_made = Counter()
+    reductions_checked = Counter()
+
+    def __init__(self, bg_board=None, solution_store=None, metrics=None):
+        self.bg_board = bg_board if bg_board is not None else BackgroundBoardNbN()
+        self.solution_store = solution_store  # optional SolutionStore the generated 9x9 boards get written to
+        self.metrics = metrics if metrics is not None else Metrics()  # holds the counters
+        self.profiler = None
+        self.rater = BackgroundRater(bg_board=self.bg_board, solution_store=solution_store)
+        self.hardest_technique = None  # hardest technique the last generated board needs, see BackgroundRater
+        self.rating = None
+        self.recursions_made = 0
+        self.reductions_checked = 0
+
+    @property
+    def isBoardUniquelySolvable(self):
+        return self.check_uniqueness()
+
+    def check_uniqueness(self, cleared_cell=None):
+        """
+        whether the board still has a single solution, cleared_cell is the cell that just lost its digit. A search per
+        cleared cell is too slow on the boards above 9x9, so they only lose the digits singles bring back, which
+        proves uniqueness just as well
+        """
+        if self.bg_board.size > 9:
+            return self.bg_board.is_resolvable_by_singles(cleared_cell)
+        return self.bg_board.isUniquelySolvable
+
+    def generate(self, difficulty=Difficulty.HARD):
+        """
+        generates a new board into self.bg_board, the resolved cells of the returned board are the givens. The board
+        gets rated on the way, hardest_technique and rating hold the result
+        """
+        self.recursions_made = 0
+        self.reductions_checked = 0
+        with self.metrics.timer("generate"):
+            self.bg_board.clear_bg_board()
+            if self.bg_board.size > 9:  # random backtracking gets lost on the big boards
+                self.fill_board_by_pattern()
+            else:
+                self.fill_board_by_backtracking()
+            self.bg_board.clear_trail()
+            self.standard_reduction(difficulty=difficulty)
+        if self.solution_store is not None and self.bg_board.board_type is BoardType.NINE_X_NINE:
+            # only the finished board gets stored, the boards in between would never be looked up again
+            self.solution_store.count_solutions(self.bg_board.get_values(), limit=2)
+        with self.metrics.timer("rate"):
+            self.hardest_technique, self.rating = self.rater.rate(self.bg_board)  # stores the rating as well
+        self.metrics.update(rating=self.rating)
+        self.metrics.publish(force=True)
+        return self.bg_board
+
+    def fill_board_by_backtracking(self):
+        self.recursions_made += 1
+        self.metrics.publish()
+        for i, c in enumerate(self.bg_board.cells):
+            if not c.isResolved:
+                rVs = list(range(1, self.bg_board.size + 1))
+                random.shuffle(rVs)
+                for rV in rVs:
+                    if self.bg_board.is_valid(i, rV):
+                        checkpoint = self.bg_board.checkpoint()
+                        c.set_value(rV)
+                        if self.fill_board_by_backtracking():
+                            return True
+                        self.bg_board.undo(checkpoint)
+                return False
+        return True
+
+    def fill_board_by_pattern(self):
+        """
+        fills the empty board with the pattern solution (box_width * (r % box_height) + r // box_height + c) % n + 1,
+        shuffled by swapping digits, bands, stacks and the rows / cols inside them, which keeps it a solution
+        """
+        geometry = self.bg_board.geometry
+        n = geometry.size
+        box_height = geometry.box_height
+        box_width = geometry.box_width
+        digits = list(range(1, n + 1))
+        random.shuffle(digits)
+        rows = [band * box_height + r for band in random.sample(range(box_width), box_width)
+                for r in random.sample(range(box_height), box_height)]
+        cols = [stack * box_width + c for stack in random.sample(range(box_height), box_height)
+                for c in random.sample(range(box_width), box_width)]
+        for bg_row, r in zip(self.bg_board.cell_rows, rows):
+            for bgc, c in zip(bg_row, cols):
+                bgc.set_value(digits[(box_width * (r % box_height) + r // box_height + c) % n])
+        self.recursions_made += 1
+
+    def standard_reduction(self, difficulty=Difficulty.HARD):
+        # the difficulty ranges are given digit counts of the 9x9 board, the other sizes keep the same share
+        cell_count = self.bg_board.geometry.cell_count
+        goal_digit_count = round(get_difficulty_range(difficulty) * cell_count / 81)
+        given_digits = cell_count
+        while given_digits != goal_digit_count:
+            rbgCs = [bgC for bgC in self.bg_board.cells if bgC.isResolved]
+            random.shuffle(rbgCs)
+            board_b4 = [c.value for c in self.bg_board.cells]
+            for rbgC in rbgCs:  # Remove cell values one by one
+                self.reductions_checked += 1
+                self.metrics.publish()
+                if given_digits == goal_digit_count:  # until digit count is met
+                    return
+                checkpoint = self.bg_board.checkpoint()
+                rbgC.clear_value()
+                given_digits -= 1
+                if not self.check_uniqueness(cleared_cell=rbgC):  # Check if the board is still solvable
+                    self.bg_board.undo(checkpoint)
+                    given_digits += 1
+            board_aftr = [bgC.value for bgC in self.bg_board.cells]
+            if board_b4 == board_aftr:  # Break when the board hasn't changed
+                break
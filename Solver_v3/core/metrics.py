@@ -0,0 +1,164 @@
+"""
+Counters and timers the algorithms update while they run. Updating is a dict write, whoever wants to show the values
+(GUI labels, benchmarks, exporters) either reads snapshot() on its own or subscribes and gets called at most once per
+interval, no matter how often the counters change.
+The Profiler is opt-in: enable_profiling (from Profiled) on a solver or generator wraps its techniques so every call
+lands in a wall time histogram, without it the techniques run unwrapped.
+"""
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Metrics:
+
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}  # name -> [calls, total seconds]
+        self.subscriber = None
+        self.interval = 0.1
+        self._last_published = 0.0
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def update(self, **counters):
+        """sets the passed in counters to the passed in values"""
+        self.counters.update(counters)
+
+    def get(self, name, default=0):
+        return self.counters.get(name, default)
+
+    @contextmanager
+    def timer(self, name):
+        """adds the time spent inside the with block to the timer name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timer = self.timers.setdefault(name, [0, 0.0])
+            timer[0] += 1
+            timer[1] += time.perf_counter() - start
+
+    def reset(self, names=None):
+        """clears every counter and timer, or only the ones in names"""
+        if names is None:
+            self.counters.clear()
+            self.timers.clear()
+            return
+        for name in names:
+            self.counters.pop(name, None)
+            self.timers.pop(name, None)
+
+    def snapshot(self):
+        """returns a copy of the counters and timers that can be dumped as JSON"""
+        timers = {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in self.timers.items()}
+        return {"counters": dict(self.counters), "timers": timers}
+
+    def subscribe(self, subscriber, interval=0.1):
+        """subscriber gets called with a snapshot by publish, at most once every interval seconds"""
+        self.subscriber = subscriber
+        self.interval = interval
+
+    def publish(self, force=False):
+        """hands a snapshot to the subscriber if the interval has passed since the last one (or force is set)"""
+        if self.subscriber is None:
+            return
+        now = time.perf_counter()
+        if force or now - self._last_published >= self.interval:
+            self._last_published = now
+            self.subscriber(self.snapshot())
+
+
+class Counter:
+    """
+    class attribute keeping the value of an instance attribute in the instance's metrics counters, so every += on it
+    increments self.metrics
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.metrics.counters.get(self.name, 0)
+
+    def __set__(self, obj, value):
+        obj.metrics.counters[self.name] = value
+
+
+class Profiler:
+
+    def __init__(self):
+        """
+        wall time histograms per technique. Bucket k of a histogram counts the calls that took between 2 ** k and
+        2 ** (k + 1) microseconds, bucket 0 also holds everything faster
+        """
+        self.histograms = {}  # name -> {"calls", "seconds", "min", "max", "buckets"}
+        self._depths = {}
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = {"calls": 0, "seconds": 0.0, "min": seconds, "max": seconds,
+                                                 "buckets": {}}
+        histogram["calls"] += 1
+        histogram["seconds"] += seconds
+        histogram["min"] = min(histogram["min"], seconds)
+        histogram["max"] = max(histogram["max"], seconds)
+        bucket = max(0, int(seconds * 1_000_000).bit_length() - 1)
+        histogram["buckets"][bucket] = histogram["buckets"].get(bucket, 0) + 1
+
+    def wrap(self, name, function):
+        """
+        returns function timing every call into the histogram name. Recursive calls only count once, as the time of
+        the outermost call
+        """
+        depths = self._depths
+
+        @wraps(function)
+        def profiled(*args, **kwargs):
+            if depths.get(name):
+                return function(*args, **kwargs)
+            depths[name] = 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+                depths[name] = 0
+
+        return profiled
+
+    def instrument(self, obj, names):
+        """replaces the methods names of obj by wrapped ones, so every call of them lands in a histogram"""
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def to_dict(self):
+        """returns the histograms as a JSON ready dict, the buckets are named by their lower bound"""
+        histograms = {}
+        for name, histogram in self.histograms.items():
+            buckets = {f"{2 ** k}us": count for k, count in sorted(histogram["buckets"].items())}
+            histograms[name] = {**histogram, "buckets": buckets}
+        return histograms
+
+    def dump(self, path):
+        """writes the histograms to path as JSON"""
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+class Profiled:
+    PROFILED_TECHNIQUES = ()
+
+    def enable_profiling(self, profiler=None):
+        """
+        times every call of the PROFILED_TECHNIQUES into the profiler's histograms (a new Profiler by default) from
+        now on and returns the profiler, self.profiler.dump(path) writes them as JSON
+        """
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.profiler.instrument(self, self.PROFILED_TECHNIQUES)
+        return self.profiler
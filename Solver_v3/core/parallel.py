@@ -0,0 +1,173 @@
+"""
+Solving of puzzle sets on a pool of worker processes.
+Every worker keeps one BackgroundSolver for its whole life and loads each puzzle into its board, the puzzles travel
+in chunks so the pickling cost is paid per chunk instead of per puzzle.
+A single hard puzzle gets split into the branches of the top levels of its MRV tree instead (solve_parallel,
+count_solutions_parallel). There are several branches per worker and they get handed out one at a time, so a worker
+that finishes an easy branch takes the next one while the others still search. The first solution (or reaching the
+count limit) terminates the pool, so no worker keeps searching a branch that doesn't matter anymore.
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from Solver_v3.core.board import BackgroundBoardNbN
+from Solver_v3.core.canonical import SolutionCache
+from Solver_v3.core.dancing_links import DancingLinks
+from Solver_v3.core.enums import Algorithm, BoardType
+from Solver_v3.core.solver import BackgroundSolver
+
+_worker_solver = None
+_worker_algorithm = None
+_worker_cache = None
+
+
+def _init_worker(algorithm, cache_size):
+    global _worker_solver, _worker_algorithm, _worker_cache
+    _worker_solver = BackgroundSolver()
+    _worker_algorithm = algorithm
+    _worker_cache = SolutionCache(maxsize=cache_size) if cache_size else None
+
+
+def _solve_chunk(puzzles):
+    return [solve_values(_worker_solver, puzzle, algorithm=_worker_algorithm, cache=_worker_cache)
+            for puzzle in puzzles]
+
+
+def _solve_branch(values):
+    return solve_values(_worker_solver, values, algorithm=_worker_algorithm)
+
+
+def _count_branch(args):
+    values, limit = args
+    return DancingLinks(values).count_solutions(limit=limit)
+
+
+def solve_values(bg_solver, values, algorithm=Algorithm.SOLVING.DANCING_LINKS, cache=None):
+    """
+    loads the n x n nested list into the solver's board and solves it, returns the solution as a nested list or None
+    if the board has none. The solver gets a new board if its board has another size. With a SolutionCache (9x9
+    only), puzzles equivalent to an already solved one skip the solver
+    """
+    if cache is not None:
+        return cache.solve(values, bg_solver=bg_solver, algorithm=algorithm)
+    if bg_solver.bg_board.size != len(values):
+        bg_solver.bg_board = BackgroundBoardNbN(board_type=BoardType(len(values)))
+    bg_solver.bg_board.load_values(values)
+    if not bg_solver.solve(algorithm=algorithm):
+        return None
+    return bg_solver.bg_board.get_values()
+
+
+def parse_puzzle(puzzle):
+    """
+    returns the puzzle as a 9x9 nested list with 0 for empty cells. puzzle is an 81 char string ('0' or '.' for empty
+    cells), a 9x9 nested list like BackgroundBoardNbN.print_board prints or an array of 81 or 9x9 values
+    """
+    if isinstance(puzzle, str):
+        puzzle = puzzle.strip()
+        if len(puzzle) != 81:
+            raise ValueError(f"a puzzle string needs 81 chars, got {len(puzzle)}")
+        values = [int(ch) if ch in "123456789" else 0 for ch in puzzle]
+    else:
+        values = list(puzzle)
+        if len(values) == 9:
+            values = [value for row in values for value in row]
+        if len(values) != 81:
+            raise ValueError(f"a puzzle needs 81 values, got {len(values)}")
+        values = [int(value) if value else 0 for value in values]
+    return [values[row_index * 9:row_index * 9 + 9] for row_index in range(9)]
+
+
+def solve_iter(source, algorithm=Algorithm.SOLVING.DANCING_LINKS, max_workers=None, chunk_size=64,
+               max_chunks_in_flight=None, cache_size=0):
+    """
+    lazily solves every puzzle of source (any iterable of puzzles parse_puzzle understands) and yields the solutions
+    as 9x9 nested lists in the order of the puzzles, None where a puzzle has no solution.
+    Only max_chunks_in_flight chunks (twice the worker count by default) are read ahead of what got yielded, so source
+    never has to fit into memory. max_workers=1 solves in this process without a pool. With a cache_size every
+    worker keeps a SolutionCache of that size
+    """
+    puzzles = (parse_puzzle(puzzle) for puzzle in source)
+    if max_workers == 1:
+        bg_solver = BackgroundSolver()
+        cache = SolutionCache(maxsize=cache_size) if cache_size else None
+        for puzzle in puzzles:
+            yield solve_values(bg_solver, puzzle, algorithm=algorithm, cache=cache)
+        return
+    max_chunks_in_flight = max_chunks_in_flight or 2 * (max_workers or os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(algorithm, cache_size))
+    try:
+        in_flight = deque()
+        while chunk := list(islice(puzzles, chunk_size)):
+            in_flight.append(executor.submit(_solve_chunk, chunk))
+            if len(in_flight) >= max_chunks_in_flight:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:  # also runs when the caller stops iterating early
+        executor.shutdown(cancel_futures=True)
+
+
+def solve_batch(puzzles, algorithm=Algorithm.SOLVING.DANCING_LINKS, max_workers=None, chunk_size=64, cache_size=0):
+    """
+    solves every puzzle on max_workers processes (os.cpu_count() by default) and returns the solutions in the order
+    of the puzzles, None where a puzzle has no solution
+    """
+    return list(solve_iter(puzzles, algorithm=algorithm, max_workers=max_workers, chunk_size=chunk_size,
+                           cache_size=cache_size))
+
+
+def _split(values, max_workers, branches_per_worker):
+    bg_solver = BackgroundSolver(bg_board=BackgroundBoardNbN.from_values(values))
+    return bg_solver.split_mrv(min_subproblems=(max_workers or os.cpu_count() or 1) * branches_per_worker)
+
+
+def _add_up(counts, limit):
+    """sums the counts, stops taking more of them as soon as limit is reached"""
+    count = 0
+    for branch_count in counts:
+        count += branch_count
+        if limit is not None and count >= limit:
+            return limit
+    return count
+
+
+def solve_parallel(values, algorithm=Algorithm.SOLVING.DANCING_LINKS, max_workers=None, branches_per_worker=4):
+    """
+    solves one n x n nested list by searching the branches of its MRV tree on max_workers processes
+    (os.cpu_count() by default) with algorithm. Returns the first solution any worker finds as a nested list, or
+    None if the puzzle has none
+    """
+    branches = _split(values, max_workers, branches_per_worker)
+    if max_workers == 1:
+        bg_solver = BackgroundSolver()
+        solutions = (solve_values(bg_solver, branch, algorithm=algorithm) for branch in branches)
+        return next((solution for solution in solutions if solution is not None), None)
+    # a multiprocessing pool rather than an executor since only terminate stops the workers still searching
+    pool = multiprocessing.Pool(processes=max_workers, initializer=_init_worker, initargs=(algorithm, 0))
+    try:
+        solutions = pool.imap_unordered(_solve_branch, branches)
+        return next((solution for solution in solutions if solution is not None), None)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def count_solutions_parallel(values, limit=None, max_workers=None, branches_per_worker=4):
+    """
+    counts the solutions of one n x n nested list by counting the branches of its MRV tree with dancing links on
+    max_workers processes (os.cpu_count() by default). With a limit the count stops as soon as it is reached, and
+    the returned count is at most limit
+    """
+    branches = [(branch, limit) for branch in _split(values, max_workers, branches_per_worker)]
+    if max_workers == 1:
+        return _add_up(map(_count_branch, branches), limit)
+    pool = multiprocessing.Pool(processes=max_workers)
+    try:
+        return _add_up(pool.imap_unordered(_count_branch, branches), limit)
+    finally:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,79 @@
+"""
+Difficulty rating by the techniques a human needs instead of the given digit count of Difficulty.
+The rater solves with a ladder of techniques and always takes the easiest one that still makes progress: singles,
+locked candidates, subsets, fish and simple colouring chains. It reports the hardest technique it needed and a score,
+puzzles the ladder can't finish need backtracking and get the top level.
+"""
+from Solver_v3.core.board import BackgroundBoardNbN
+from Solver_v3.core.enums import BoardType
+from Solver_v3.core.solver import BackgroundSolver
+
+# technique -> level, the level of the hardest technique is the integer part of the score
+TECHNIQUE_LEVELS = {"singles": 1, "locked_candidates": 2, "subsets": 3, "fish": 4, "simple_colouring": 5,
+                    "backtracking": 6}
+
+
+class BackgroundRater:
+
+    def __init__(self, bg_board=None, solution_store=None):
+        self.bg_board = bg_board if bg_board is not None else BackgroundBoardNbN()
+        self.solution_store = solution_store  # optional SolutionStore the 9x9 ratings get written to
+        self.bg_solver = BackgroundSolver(bg_board=self.bg_board)
+        self.technique_uses = dict.fromkeys(TECHNIQUE_LEVELS, 0)  # how often each technique made progress
+        self.hardest_technique = None
+        self.score = None
+
+    def rate(self, bg_board=None):
+        """
+        rates bg_board (self.bg_board by default) and returns (hardest technique, score), the board itself stays
+        untouched. The integer part of the score is the level of the hardest technique, every use of a technique above
+        the singles adds 0.1 up to 0.9. Boards without a unique solution end up at backtracking
+        """
+        bg_board = bg_board or self.bg_board
+        bg_solver = self.bg_solver
+        technique_uses = self.technique_uses = dict.fromkeys(TECHNIQUE_LEVELS, 0)
+        checkpoint = bg_board.checkpoint()
+        # the ladder only runs once the singles are stuck, and its changes get the singles going again first
+        for technique, _ in bg_solver.iter_propagation(
+                unit_reductions=(bg_solver.reduction_by_sudoku_set, bg_solver.reduction_by_hidden_singles_set),
+                board_reductions=(self.reduction_by_easiest_technique,), bg_board=bg_board):
+            if technique != "reduction_by_easiest_technique":
+                technique_uses["singles"] += 1
+        if not bg_board.isSolved:
+            technique_uses["backtracking"] += 1
+        bg_board.undo(checkpoint)
+        self.hardest_technique = max((technique for technique, uses in technique_uses.items() if uses),
+                                     key=TECHNIQUE_LEVELS.get, default="singles")
+        advanced_uses = sum(uses for technique, uses in technique_uses.items() if TECHNIQUE_LEVELS[technique] > 1)
+        self.score = TECHNIQUE_LEVELS[self.hardest_technique] + min(advanced_uses, 9) / 10
+        if self.solution_store is not None and bg_board.board_type is BoardType.NINE_X_NINE:
+            self.solution_store.set_rating(bg_board.get_values(), self.score)
+        return self.hardest_technique, self.score
+
+    def reduction_by_easiest_technique(self, bg_board=None):
+        """
+        runs the techniques above the singles from the easiest up and stops at the first one that changed something
+        """
+        bg_board = bg_board or self.bg_board
+        if all(bgc.isResolved for bgc in bg_board.cells):
+            return False  # the singles solved the board, the techniques would only scan it for nothing
+        bg_solver = self.bg_solver
+        for technique, reduction in (("locked_candidates", bg_solver.reduction_by_locked_candidates),
+                                     ("subsets", self.reduction_by_one_subset),
+                                     ("fish", bg_solver.reduction_by_fish),
+                                     ("simple_colouring", bg_solver.reduction_by_simple_colouring)):
+            if reduction(bg_board=bg_board):
+                self.technique_uses[technique] += 1
+                return True
+        return False
+
+    def reduction_by_one_subset(self, bg_board=None):
+        """
+        naked / hidden subsets of the first row, col or box that has any, returns how many possible values got removed
+        """
+        bg_board = bg_board or self.bg_board
+        for unit in bg_board.units:
+            reductions = self.bg_solver.reduction_by_subsets(unit=unit)
+            if reductions:
+                return reductions
+        return 0
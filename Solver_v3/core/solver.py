@@ -0,0 +1,708 @@
+from collections import deque
+
+from Solver_v3.core.bitmask import DIGIT_BIT, get_mask_digits, get_subsets
+from Solver_v3.core.board import BackgroundBoardNbN, get_digit_positions
+from Solver_v3.core.dancing_links import DancingLinks
+from Solver_v3.core.enums import Algorithm, BoardType, SolveType
+from Solver_v3.core.metrics import Counter, Metrics, Profiled
+
+
+class BackgroundSolver(Profiled):
+    PROFILED_TECHNIQUES = ("solve", "propagate", "reduction_by_sudoku", "reduction_by_sudoku_set",
+                           "reduction_by_hidden_subsets_set", "reduction_by_locked_candidates", "reduction_by_fish",
+                           "reduction_by_simple_colouring", "reduction_by_constellation_set",
+                           "reduction_by_constellation_optimized_set", "backtracking", "backtracking_mrv",
+                           "dancing_links")
+    # naked / hidden subsets never need to be bigger than half a 9x9 unit, on the bigger boards the amount of
+    # constellations would explode past that
+    MAX_CONSTELLATION_SIZE = 4
+    # the counters live in self.metrics, so subscribers see them grow during long solves
+    reductions_by_sudoku = Counter()
+    reductions_by_hidden_subsets = Counter()
+    reductions_by_locked_candidates = Counter()
+    reductions_by_fish = Counter()
+    reductions_by_colouring = Counter()
+    reductions_by_constellations = Counter()
+    constellations_checked = Counter()
+    recursions_checked = Counter()
+
+    def __init__(self, bg_board=None, solution_store=None, metrics=None):
+        self.bg_board = bg_board if bg_board is not None else BackgroundBoardNbN()
+        self.solution_store = solution_store  # optional SolutionStore the uniqueness checks go through
+        self.metrics = metrics if metrics is not None else Metrics()  # holds the counters
+        self.profiler = None
+        self.steps = None  # the generator of iter_steps that next_step resumes
+        self.reductions_by_sudoku = 0
+        self.reductions_by_hidden_subsets = 0
+        self.reductions_by_locked_candidates = 0
+        self.reductions_by_fish = 0
+        self.reductions_by_colouring = 0
+        self.reductions_by_constellations = 0
+        self.constellations_checked = 0
+        self.recursions_checked = 0
+
+    def check_if_bg_board_is_uniquely_solvable(self, bg_board):
+        """
+        runs the reductions of ELIMINATION_BY_CONSTELLATION, so whatever passes the check gets finished by that mode.
+        ELIMINATION_OPTIMIZED runs a superset of them and finishes it as well
+        """
+        return self.propagate(unit_reductions=(self.reduction_by_constellation_set,), bg_board=bg_board)
+
+    def propagate(self, unit_reductions, board_reductions=(), bg_board=None):
+        """
+        runs the unit reductions on a worklist of rows, cols and boxes until nothing changes anymore, see
+        iter_propagation. Returns whether the board got solved.
+        """
+        bg_board = bg_board or self.bg_board
+        for _ in self.iter_propagation(unit_reductions, board_reductions=board_reductions, bg_board=bg_board):
+            pass
+        return bg_board.isSolved
+
+    def iter_propagation(self, unit_reductions, board_reductions=(), bg_board=None):
+        """
+        runs the unit reductions on a worklist of rows, cols and boxes until nothing changes anymore. Every unit starts
+        on the list, afterwards only the three units of a cell whose possible values shrank get queued again. The
+        changes are read off the board's trail. The board reductions (e.g. locked candidates, fish) work across units
+        and run whenever the worklist is empty, their changes queue units the same way.
+        Yields (technique name, changes) after every reduction call that changed something, changes are the new trail
+        entries. The worklist lives in the generator, so the propagation can be paused between any two steps.
+        """
+        bg_board = bg_board or self.bg_board
+        units = bg_board.units
+        trail = bg_board.trail
+        queue = deque(range(len(units)))
+        isQueued = [True] * len(units)
+        seen = len(trail)
+        while True:
+            while queue:
+                unit_index = queue.popleft()
+                isQueued[unit_index] = False
+                for reduction in unit_reductions:
+                    reduction(units[unit_index])
+                    if len(trail) != seen:
+                        changes = trail[seen:]
+                        seen = self._queue_changed_units(trail, seen, queue=queue, isQueued=isQueued)
+                        self.metrics.publish()
+                        yield reduction.__name__, changes
+            for reduction in board_reductions:
+                reduction(bg_board=bg_board)
+                if len(trail) != seen:
+                    changes = trail[seen:]
+                    seen = self._queue_changed_units(trail, seen, queue=queue, isQueued=isQueued)
+                    self.metrics.publish()
+                    yield reduction.__name__, changes
+            if not queue:
+                return
+
+    def _queue_changed_units(self, trail, seen, queue, isQueued):
+        """queues the units of every cell changed since trail position seen, returns the new trail position"""
+        for cell, *_ in trail[seen:]:
+            for u in cell.units:
+                if not isQueued[u]:
+                    isQueued[u] = True
+                    queue.append(u)
+        return len(trail)
+
+    @property
+    def isBoardUniquelySolvable(self):
+        if self.solution_store is not None and self.bg_board.board_type is BoardType.NINE_X_NINE:
+            return self.solution_store.count_solutions(self.bg_board.get_values(), limit=2) == 1
+        return self.bg_board.isUniquelySolvable
+
+    @property
+    def isBoardSolvableByElimination(self):
+        return self.bg_board.isSolvableByElimination
+
+    def solve(self, algorithm=Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING):
+        """solves self.bg_board in place with the passed in algorithm, returns whether the board got solved"""
+        self.reset_counters()
+        self.bg_board.clear_trail()
+        with self.metrics.timer("solve"):
+            match algorithm:
+                case Algorithm.SOLVING.ELIMINATION_BY_CONSTELLATION:
+                    if self.isBoardSolvableByElimination:
+                        self.reduction_by_constellation()
+                case Algorithm.SOLVING.ELIMINATION_OPTIMIZED:
+                    if self.isBoardSolvableByElimination:
+                        self.reduction_by_constellation_optimized()
+                case Algorithm.SOLVING.BACKTRACKING:
+                    self.backtracking()
+                case Algorithm.SOLVING.BACKTRACKING_OPTIMIZED:
+                    self.reduction_by_sudoku()
+                    self.backtracking()
+                case Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING:
+                    self.reduction_by_constellation_plus_backtracking()
+                case Algorithm.SOLVING.BACKTRACKING_MRV:
+                    self.backtracking_mrv()
+                case Algorithm.SOLVING.DANCING_LINKS:
+                    self.dancing_links()
+        self.metrics.publish(force=True)
+        return self.bg_board.isSolved
+
+    def reset_counters(self):
+        self.reductions_by_sudoku = 0
+        self.reductions_by_hidden_subsets = 0
+        self.reductions_by_locked_candidates = 0
+        self.reductions_by_fish = 0
+        self.reductions_by_colouring = 0
+        self.reductions_by_constellations = 0
+        self.constellations_checked = 0
+        self.recursions_checked = 0
+
+    def start_steps(self, algorithm=Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING, bg_board=None):
+        """starts solving bg_board (self.bg_board by default) step by step, next_step does the steps"""
+        self.reset_counters()
+        self.steps = self.iter_steps(algorithm=algorithm, bg_board=bg_board)
+
+    def next_step(self, until=SolveType.NEXT_REDUCTION):
+        """
+        resumes the steps started by start_steps until the next reduction (SolveType.NEXT_REDUCTION) or until the next
+        cell got resolved (SolveType.NEXT_DIGIT, SolveType.COMPLETE runs them all). Returns the cells that changed
+        meanwhile, an empty list once there are no steps left
+        """
+        if self.steps is None:
+            return []
+        changed_cells = {}  # dict as an ordered set
+        for _, cells in self.steps:
+            changed_cells.update(dict.fromkeys(cells))
+            if until is SolveType.NEXT_REDUCTION:
+                break
+            if until is SolveType.NEXT_DIGIT and any(c.isResolved for c in cells):
+                break
+        else:
+            self.steps = None
+        self.metrics.publish(force=True)
+        return list(changed_cells)
+
+    def iter_steps(self, algorithm=Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING, bg_board=None):
+        """
+        solves bg_board (self.bg_board by default) one deduction at a time and yields (technique name, cells) after
+        each, cells are the cells whose possible values shrank. ELIMINATION_BY_CONSTELLATION steps through the
+        constellations, every other algorithm through the optimized elimination. Where the eliminations get stuck,
+        the algorithms that search place the cell with the fewest possible values from the solution dancing links
+        finds (one "dancing_links" step) and the eliminations go on from there.
+        """
+        bg_board = bg_board or self.bg_board
+        if algorithm is Algorithm.SOLVING.ELIMINATION_BY_CONSTELLATION:
+            unit_reductions = (self.reduction_by_constellation_set,)
+            board_reductions = ()
+        else:
+            unit_reductions = (self.reduction_by_sudoku_set, self.reduction_by_hidden_subsets_set,
+                               self.reduction_by_constellation_optimized_set)
+            board_reductions = (self.reduction_by_locked_candidates, self.reduction_by_fish)
+        canSearch = algorithm not in (Algorithm.SOLVING.ELIMINATION_BY_CONSTELLATION,
+                                      Algorithm.SOLVING.ELIMINATION_OPTIMIZED)
+        solution = None
+        while True:
+            for technique, changes in self.iter_propagation(unit_reductions, board_reductions=board_reductions,
+                                                            bg_board=bg_board):
+                yield technique, list(dict.fromkeys(cell for cell, *_ in changes))
+            unresolved_cells = [bgc for bgc in bg_board.cells if not bgc.isResolved]
+            if not canSearch or not unresolved_cells or any(not bgc.pV_mask for bgc in unresolved_cells):
+                return
+            if solution is None:
+                dlx = DancingLinks(bg_board.get_values())
+                solution = dlx.solve()
+                self.recursions_checked += dlx.nodes_visited
+                if solution is None:
+                    return
+            bgc = min(unresolved_cells, key=lambda c: c.pV_mask.bit_count())
+            bgc.set_value(solution[bg_board.geometry.row_of[bgc.index]][bg_board.geometry.col_of[bgc.index]])
+            yield "dancing_links", [bgc]
+
+    def get_counters(self):
+        return {"reductions_by_sudoku": self.reductions_by_sudoku,
+                "reductions_by_hidden_subsets": self.reductions_by_hidden_subsets,
+                "reductions_by_locked_candidates": self.reductions_by_locked_candidates,
+                "reductions_by_fish": self.reductions_by_fish,
+                "reductions_by_colouring": self.reductions_by_colouring,
+                "reductions_by_constellations": self.reductions_by_constellations,
+                "constellations_checked": self.constellations_checked,
+                "recursions_checked": self.recursions_checked}
+
+    def backtracking(self):
+        unresolved_cells = [bgc for bgc in self.bg_board.cells if not bgc.isResolved]
+        for bgc in unresolved_cells:
+            for value in get_mask_digits(bgc.pV_mask):
+                if self.bg_board.is_valid(bgc.index, value):
+                    checkpoint = self.bg_board.checkpoint()
+                    bgc.set_value(value=value)
+                    self.recursions_checked += 1
+                    self.metrics.publish()
+                    if self.backtracking():
+                        return True
+                    self.bg_board.undo(checkpoint)  # brings back the possible values the cell had before
+            return False
+        return True
+
+    def backtracking_mrv(self):
+        """
+        backtracking that always branches on the unresolved cell with the fewest possible values (minimum remaining
+        values), ties go to the first such cell in board order. Every placement removes its value from the peers and
+        places peers that are left with a single possible value (forward checking). All of those changes land on the
+        board's trail, so a dead end gets undone by popping back to the checkpoint taken before the placement.
+        """
+        self.reduction_by_sudoku()
+        if not self.isBoardConsistent:
+            return False
+        return self._backtracking_mrv()
+
+    @property
+    def isBoardConsistent(self):
+        """
+        whether every cell still has a possible value and no row, col or box holds a value twice. The forward checking
+        only compares against the cells it places, so the starting board has to be checked on its own
+        """
+        if any(not bgc.pV_mask for bgc in self.bg_board.cells):
+            return False
+        for unit in self.bg_board.units:
+            placed_mask = 0
+            for bgc in unit:
+                if bgc.isResolved:
+                    if placed_mask & DIGIT_BIT[bgc.value]:
+                        return False
+                    placed_mask |= DIGIT_BIT[bgc.value]
+        return True
+
+    def _backtracking_mrv(self):
+        unresolved_cells = [bgc for bgc in self.bg_board.cells if not bgc.isResolved]
+        if not unresolved_cells:
+            return True
+        bgc = min(unresolved_cells, key=lambda c: c.pV_mask.bit_count())
+        for value in get_mask_digits(bgc.pV_mask):
+            self.recursions_checked += 1
+            self.metrics.publish()
+            checkpoint = self.bg_board.checkpoint()
+            if self._place_mrv(bgc, value) and self._backtracking_mrv():
+                return True
+            self.bg_board.undo(checkpoint)
+        return False
+
+    def _place_mrv(self, bgc, value):
+        """
+        places the value and removes it from the unresolved peers, peers that get resolved by that pass their value
+        on the same way. The rows, cols and boxes that lost possible values then get checked for hidden singles, which
+        get placed the same way. Without them the search drowns on the boards above 9x9. Returns False as soon as a
+        cell is left without possible values, a value shows up twice or a value has no cell left in a row, col or box
+        """
+        bg_board = self.bg_board
+        cells = bg_board.cells
+        units = bg_board.units
+        unit_masks = bg_board.unit_masks
+        geometry = bg_board.geometry
+        peers = geometry.peers
+        cell_units = geometry.cell_units
+        all_digits = geometry.all_digits
+        bgc.set_value(value=value)
+        placed = [bgc]
+        changed_units = set()
+        while placed:
+            while placed:
+                c = placed.pop()
+                changed_units.update(cell_units[c.index])
+                value_bit = DIGIT_BIT[c.value]
+                for i in peers[c.index]:
+                    peer = cells[i]
+                    if peer.isResolved:
+                        if peer.value == c.value:
+                            return False
+                    elif peer.pV_mask & value_bit:
+                        peer.reduce_possible_values(value_bit)
+                        if not peer.pV_mask:
+                            return False
+                        if peer.isResolved:
+                            placed.append(peer)
+                        else:
+                            changed_units.update(cell_units[i])
+            checked_units, changed_units = changed_units, set()
+            for u in checked_units:
+                seen_once = seen_twice = 0
+                for c in units[u]:
+                    if not c.isResolved:
+                        seen_twice |= seen_once & c.pV_mask
+                        seen_once |= c.pV_mask
+                missing = all_digits & ~unit_masks[u]
+                if missing & ~seen_once:
+                    return False
+                for digit in get_mask_digits(missing & ~seen_twice):
+                    value_bit = DIGIT_BIT[digit]
+                    # a hidden single placed before can have taken the only cell of this digit
+                    c = next((c for c in units[u] if not c.isResolved and c.pV_mask & value_bit), None)
+                    if c is None:
+                        return False
+                    c.reduce_possible_values(all_digits & ~value_bit)
+                    placed.append(c)
+        return True
+
+    def split_mrv(self, min_subproblems):
+        """
+        splits the board into the branches of the top levels of the MRV tree, one level deeper at a time until there
+        are at least min_subproblems open branches or none of them can be split any further. Returns the branches as
+        n x n nested lists, the board itself stays untouched. The branches place different values into the same cells,
+        so together they hold every solution of the board exactly once
+        """
+        checkpoint = self.bg_board.checkpoint()
+        self.reduction_by_sudoku()
+        branches = []
+        if self.isBoardConsistent:
+            depth = 0
+            while True:
+                branches = []
+                isSplittable = self._collect_mrv_branches(depth, branches)
+                if len(branches) >= min_subproblems or not isSplittable:
+                    break
+                depth += 1
+        self.bg_board.undo(checkpoint)
+        return branches
+
+    def _collect_mrv_branches(self, depth, branches):
+        """appends the branches depth levels further down, returns whether any of them could be split further"""
+        unresolved_cells = [bgc for bgc in self.bg_board.cells if not bgc.isResolved]
+        if not unresolved_cells or not depth:
+            branches.append(self.bg_board.get_values())
+            return bool(unresolved_cells)
+        bgc = min(unresolved_cells, key=lambda c: c.pV_mask.bit_count())
+        isSplittable = False
+        for value in get_mask_digits(bgc.pV_mask):
+            self.recursions_checked += 1
+            checkpoint = self.bg_board.checkpoint()
+            if self._place_mrv(bgc, value):
+                isSplittable |= self._collect_mrv_branches(depth - 1, branches)
+            self.bg_board.undo(checkpoint)
+        return isSplittable
+
+    def dancing_links(self):
+        """solves the board as an exact cover problem, every chosen placement counts as a recursion"""
+        dlx = DancingLinks(self.bg_board.get_values())
+        solution = dlx.solve()
+        self.recursions_checked += dlx.nodes_visited
+        if solution is None:
+            return False
+        for bg_row, row in zip(self.bg_board.cell_rows, solution):
+            for bgc, value in zip(bg_row, row):
+                if not bgc.isResolved:
+                    bgc.set_value(value)
+        return True
+
+    def count_solutions(self, limit=2):
+        """counts the solutions of the board without changing it, stops after limit solutions (None for all)"""
+        dlx = DancingLinks(self.bg_board.get_values())
+        count = dlx.count_solutions(limit=limit)
+        self.recursions_checked += dlx.nodes_visited
+        return count
+
+    def iter_solutions(self):
+        """yields every solution of the board as a 9x9 nested list without changing the board"""
+        yield from DancingLinks(self.bg_board.get_values()).iter_solutions()
+
+    def reduction_by_constellation(self):
+        return self.propagate(unit_reductions=(self.reduction_by_constellation_set,))
+
+    def reduction_by_constellation_optimized(self):
+        return self.propagate(unit_reductions=(self.reduction_by_sudoku_set,
+                                               self.reduction_by_hidden_subsets_set,
+                                               self.reduction_by_constellation_optimized_set),
+                              board_reductions=(self.reduction_by_locked_candidates, self.reduction_by_fish))
+
+    def reduction_by_sudoku(self):
+        rbgCs = [bgc for bgc in self.bg_board.cells if bgc.isResolved]  # get all resolved cells
+        for rbgC in rbgCs:
+            ubgCs = self.get_unresolved_cells_in_rcb(
+                rbgC)  # get a set of unresolved cells in the same row, col and box of the resolved or given cells
+            for ubgC in ubgCs:  # Reduce the unresolved cell's pVs by the value of the resolved or given cell
+                b4 = ubgC.pV_mask.bit_count()
+                ubgC.reduce_possible_values(DIGIT_BIT[rbgC.value])
+                aftr = ubgC.pV_mask.bit_count()
+                self.reductions_by_sudoku += b4 - aftr
+                if ubgC.isResolved:
+                    rbgCs.append(ubgC)
+        if self.bg_board.isSolved:  # This check gets done in case we solve the board with only this method
+            return
+
+    def reduction_by_sudoku_set(self, cell_set):
+        """removes the values placed in the row, col or box from its unresolved cells, returns how many got removed"""
+        placed_mask = 0
+        for bgc in cell_set:
+            if bgc.isResolved:
+                placed_mask |= DIGIT_BIT[bgc.value]
+        reductions = 0
+        for bgc in cell_set:
+            if not bgc.isResolved and bgc.pV_mask & placed_mask:
+                b4 = bgc.pV_mask.bit_count()
+                bgc.reduce_possible_values(placed_mask)
+                reductions += b4 - bgc.pV_mask.bit_count()
+        self.reductions_by_sudoku += reductions
+        return reductions
+
+    def get_unresolved_cells_in_rcb(self, cell):
+        """
+        cell passed in here should be resolved or given.
+        Returns a list of the unresolved cells in the same row, col and box as the passed in cell
+        """
+        cells = self.bg_board.cells
+        return [cells[i] for i in self.bg_board.geometry.peers[cell.index] if not cells[i].isResolved]
+
+    def reduction_by_hidden_singles_set(self, cell_set):
+        return self.reduction_by_hidden_subsets_set(cell_set, max_size=1)
+
+    def reduction_by_hidden_subsets_set(self, cell_set, max_size=3):
+        """
+        cell_set is a row, col or box. Looks at it from the digit side: a value that only fits into one cell (hidden
+        single) or k values that only fit into the same k cells (hidden pair / triple) leave no room for any other
+        value in those cells. Returns how many possible values got removed.
+        """
+        reductions = 0
+        all_digits = (1 << len(cell_set)) - 1  # a unit has as many cells as the board has digits
+        positions = get_digit_positions(cell_set)
+        placed_mask = 0
+        for bgc in cell_set:
+            if bgc.isResolved:
+                placed_mask |= DIGIT_BIT[bgc.value]
+        for digit in get_mask_digits(all_digits & ~placed_mask):  # hidden singles first, they are the cheapest
+            if positions[digit].bit_count() == 1:
+                bgc = cell_set[positions[digit].bit_length() - 1]
+                if not bgc.isResolved:
+                    b4 = bgc.pV_mask.bit_count()
+                    bgc.reduce_possible_values(all_digits & ~DIGIT_BIT[digit])
+                    reductions += b4 - bgc.pV_mask.bit_count()
+                    placed_mask |= DIGIT_BIT[digit]
+        if max_size < 2:
+            self.reductions_by_hidden_subsets += reductions
+            return reductions
+        if reductions:
+            positions = get_digit_positions(cell_set)
+        digits = get_mask_digits(all_digits & ~placed_mask)
+        hidden_positions = [positions[digit] for digit in digits]
+        for indices, shared_positions in self._iter_constellations(masks=hidden_positions, max_size=max_size,
+                                                                   min_size=2):
+            hidden_pV_mask = 0
+            for j in indices:
+                hidden_pV_mask |= DIGIT_BIT[digits[j]]
+            for i, bgc in enumerate(cell_set):
+                if shared_positions >> i & 1 and not bgc.isResolved and bgc.pV_mask & ~hidden_pV_mask:
+                    b4 = bgc.pV_mask.bit_count()
+                    bgc.reduce_possible_values(all_digits & ~hidden_pV_mask)
+                    reductions += b4 - bgc.pV_mask.bit_count()
+        self.reductions_by_hidden_subsets += reductions
+        return reductions
+
+    def reduction_by_locked_candidates(self, bg_board=None):
+        """
+        pointing: a value that only fits into one row / col of a box can't go anywhere else in that row / col.
+        claiming (box line reduction): a value that only fits into one box of a row / col can't go anywhere else in
+        that box. Returns how many possible values got removed.
+        """
+        bg_board = bg_board or self.bg_board
+        geometry = bg_board.geometry
+        box_height = geometry.box_height
+        box_width = geometry.box_width
+        digits = range(1, geometry.size + 1)
+        reductions = 0
+        for box_index, box in enumerate(bg_board.cell_boxes):
+            band, stack = divmod(box_index, box_height)  # a band holds box_height boxes
+            positions = get_digit_positions(box)
+            for digit in digits:
+                if positions[digit].bit_count() < 2:  # placed or a hidden single, nothing to point with
+                    continue
+                for k, box_row_mask in enumerate(geometry.box_row_masks):
+                    if not positions[digit] & ~box_row_mask:
+                        row = bg_board.cell_rows[band * box_height + k]
+                        reductions += self._remove_digit(
+                            digit, [c for i, c in enumerate(row) if i // box_width != stack])
+                for k, box_col_mask in enumerate(geometry.box_col_masks):
+                    if not positions[digit] & ~box_col_mask:
+                        col = bg_board.cell_cols[stack * box_width + k]
+                        reductions += self._remove_digit(
+                            digit, [c for i, c in enumerate(col) if i // box_height != band])
+        for line_index in range(geometry.size):
+            for line, isRow in ((bg_board.cell_rows[line_index], True),
+                                (bg_board.cell_cols[line_index], False)):
+                positions = get_digit_positions(line)
+                for digit in digits:
+                    if positions[digit].bit_count() < 2:
+                        continue
+                    for k, line_box_mask in enumerate(geometry.row_box_masks if isRow else geometry.col_box_masks):
+                        if not positions[digit] & ~line_box_mask:
+                            if isRow:
+                                box = bg_board.cell_boxes[(line_index // box_height) * box_height + k]
+                                rest = [c for i, c in enumerate(box) if i // box_width != line_index % box_height]
+                            else:
+                                box = bg_board.cell_boxes[k * box_height + line_index // box_width]
+                                rest = [c for i, c in enumerate(box) if i % box_width != line_index % box_width]
+                            reductions += self._remove_digit(digit, rest)
+        self.reductions_by_locked_candidates += reductions
+        return reductions
+
+    def reduction_by_fish(self, bg_board=None, max_size=4):
+        """
+        X-Wing (2), Swordfish (3) and Jellyfish (4) on the digit planes. If a value only fits into the same n cols of
+        n rows (the base sets), each of those cols gets its value from one of the n rows, so it can't go anywhere else
+        in those cols. The same goes for rows and cols swapped. Fish bigger than 4 are the complement of a smaller
+        fish in the other direction. Returns how many possible values got removed.
+        """
+        bg_board = bg_board or self.bg_board
+        n = bg_board.size
+        all_digits = bg_board.geometry.all_digits
+        reductions = 0
+        for digit in range(1, n + 1):
+            plane = bg_board.get_digit_plane(digit)
+            if not plane:
+                continue
+            row_masks = [(plane >> n * r) & all_digits for r in range(n)]
+            col_masks = [0] * n
+            for r, row_mask in enumerate(row_masks):
+                for c in get_mask_digits(row_mask):  # bit c - 1 of a row mask stands for col c - 1
+                    col_masks[c - 1] |= 1 << r
+            for base_masks, cover_lines in ((row_masks, bg_board.cell_cols), (col_masks, bg_board.cell_rows)):
+                base_lines = [i for i, mask in enumerate(base_masks) if mask.bit_count() >= 2]
+                masks = [base_masks[i] for i in base_lines]
+                for indices, cover_mask in self._iter_constellations(masks=masks, max_size=max_size, min_size=2):
+                    base_mask = 0
+                    for i in indices:
+                        base_mask |= 1 << base_lines[i]
+                    for c in get_mask_digits(cover_mask):
+                        reductions += self._remove_digit(
+                            digit, [bgc for i, bgc in enumerate(cover_lines[c - 1]) if not base_mask >> i & 1])
+        self.reductions_by_fish += reductions
+        return reductions
+
+    def reduction_by_simple_colouring(self, bg_board=None):
+        """
+        single digit chains. Where a value only fits into two cells of a row, col or box (conjugate pair) one of them
+        holds it. Chaining the pairs colours their cells in two alternating colours, and one of the colours holds the
+        value in all of its cells. A colour seeing itself is the wrong one (colour wrap), a cell seeing both colours
+        can't hold the value (colour trap). Returns how many possible values got removed.
+        """
+        bg_board = bg_board or self.bg_board
+        cells = bg_board.cells
+        geometry = bg_board.geometry
+        peers = geometry.peers
+        unit_positions = [get_digit_positions(unit) for unit in bg_board.units]
+        reductions = 0
+        for digit in range(1, geometry.size + 1):
+            links = {}
+            for unit, positions in zip(geometry.units, unit_positions):
+                if positions[digit].bit_count() == 2:
+                    a = unit[(positions[digit] & -positions[digit]).bit_length() - 1]
+                    b = unit[positions[digit].bit_length() - 1]
+                    if not cells[a].isResolved and not cells[b].isResolved:
+                        links.setdefault(a, []).append(b)
+                        links.setdefault(b, []).append(a)
+            colours = {}
+            for start in links:
+                if start in colours:
+                    continue
+                colours[start] = 0
+                chain = [start]
+                for i in chain:  # grows while it gets walked
+                    for j in links[i]:
+                        if j not in colours:
+                            colours[j] = 1 - colours[i]
+                            chain.append(j)
+                sides = ([i for i in chain if not colours[i]], [i for i in chain if colours[i]])
+                for side in sides:
+                    side_set = set(side)
+                    if any(side_set.intersection(peers[i]) for i in side):
+                        reductions += self._remove_digit(digit, [cells[i] for i in side])
+                        break
+                else:
+                    seen_by_both = {p for i in sides[0] for p in peers[i]} & {p for i in sides[1] for p in peers[i]}
+                    reductions += self._remove_digit(digit, [cells[i] for i in seen_by_both.difference(chain)])
+        self.reductions_by_colouring += reductions
+        return reductions
+
+    def _remove_digit(self, digit, bgCs):
+        """removes the digit from every unresolved cell, returns how many cells lost it"""
+        reductions = 0
+        for bgc in bgCs:
+            if not bgc.isResolved and bgc.pV_mask & DIGIT_BIT[digit]:
+                bgc.reduce_possible_values(DIGIT_BIT[digit])
+                reductions += 1
+        return reductions
+
+    def reduction_by_constellation_set(self, bgCs):  # This function is currently used to determine a boards solvability
+        """bgCs is a row, col or box of BackgroundCells"""
+        if bgCs:
+            self.reduction_by_subsets(unit=bgCs)
+
+    def reduction_by_constellation_optimized_set(self, cell_set):
+        """cell_set is a row, col or box of BackgroundCells"""
+        if [bgc for bgc in cell_set if not bgc.isResolved]:
+            self.reductions_by_constellations += self.reduction_by_subsets(unit=cell_set)
+
+    def reduction_by_subsets(self, unit):
+        """
+        unit is a row, col or box. Every constellation of k unresolved cells that only share k possible values (naked
+        subset) gets those values removed from the rest of the unit. The other n - k cells then hold the remaining
+        n - k values on their own (hidden subset), so constellations bigger than n // 2 are found as the smaller
+        hidden subset of the complement and neither side has to be searched past n // 2. Boards above 9x9 stop at
+        MAX_CONSTELLATION_SIZE instead.
+        Returns how many possible values got removed.
+        """
+        placed_mask = 0
+        ubgCs = []
+        for bgc in unit:
+            if bgc.isResolved:
+                placed_mask |= DIGIT_BIT[bgc.value]
+            else:
+                ubgCs.append(bgc)
+        reductions = 0
+        for ubgC in ubgCs:
+            if ubgC.pV_mask & placed_mask:
+                b4 = ubgC.pV_mask.bit_count()
+                ubgC.reduce_possible_values(placed_mask)
+                reductions += b4 - ubgC.pV_mask.bit_count()
+        if len(ubgCs) < 2:
+            return reductions
+        max_size = min(len(ubgCs) // 2, self.MAX_CONSTELLATION_SIZE)
+        # naked subsets: k cells sharing k values
+        masks = [ubgC.pV_mask for ubgC in ubgCs]
+        for indices, shared_pV_mask in self._iter_constellations(masks=masks, max_size=max_size):
+            for i, ubgC in enumerate(ubgCs):
+                if i not in indices and masks[i] & shared_pV_mask:
+                    ubgC.reduce_possible_values(shared_pV_mask)
+                    reductions += masks[i].bit_count() - ubgC.pV_mask.bit_count()
+                    masks[i] = ubgC.pV_mask
+        # hidden subsets: k values that only fit into k cells
+        all_digits = (1 << len(unit)) - 1
+        digits = get_mask_digits(all_digits & ~placed_mask)
+        digit_positions = get_digit_positions(ubgCs)
+        positions = [digit_positions[digit] for digit in digits]
+        for indices, shared_positions in self._iter_constellations(masks=positions, max_size=max_size):
+            hidden_pV_mask = 0
+            for j in indices:
+                hidden_pV_mask |= DIGIT_BIT[digits[j]]
+            for i, ubgC in enumerate(ubgCs):
+                if shared_positions >> i & 1 and ubgC.pV_mask & ~hidden_pV_mask:
+                    b4 = ubgC.pV_mask.bit_count()
+                    ubgC.reduce_possible_values(all_digits & ~hidden_pV_mask)
+                    reductions += b4 - ubgC.pV_mask.bit_count()
+        return reductions
+
+    def _iter_constellations(self, masks, max_size, min_size=1):
+        """
+        yields (indices, shared_mask) for every constellation of up to max_size masks whose shared mask has exactly
+        as many bits as the constellation has masks. The constellations are the precomputed get_subsets, every subset
+        containing a mask with more bits than the constellation size gets skipped before its shared mask is built.
+        """
+        for size in range(min_size, min(max_size, len(masks)) + 1):
+            eligible = 0
+            for i, mask in enumerate(masks):
+                if mask.bit_count() <= size:
+                    eligible |= 1 << i
+            if eligible.bit_count() < size:
+                continue
+            for subset, indices in get_subsets(len(masks), size):
+                if subset & ~eligible:
+                    continue
+                self.constellations_checked += 1
+                shared_mask = 0
+                for i in indices:
+                    shared_mask |= masks[i]
+                if shared_mask.bit_count() == size:
+                    yield indices, shared_mask
+
+    def reduction_by_constellation_plus_backtracking(self):
+        """the optimized elimination, whatever it leaves unresolved gets finished by backtracking_mrv"""
+        if not self.reduction_by_constellation_optimized():
+            self.backtracking_mrv()
@@ -0,0 +1,106 @@
+"""
+Persistent puzzle store on SQLite: solution, solution count and rating of every puzzle that went through it, kept
+across restarts and shared between processes (one connection per process, WAL journal).
+Puzzles are keyed on their canonical form, so equivalent puzzles share one row and the stored solution gets mapped
+back onto the asked puzzle.
+"""
+import sqlite3
+
+from Solver_v3.core.canonical import canonicalize, uncanonicalize
+from Solver_v3.core.dancing_links import DancingLinks
+
+
+class SolutionStore:
+
+    def __init__(self, path):
+        """path is the database file, it gets created if it doesn't exist yet"""
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # solution_count is exact while it is below count_limit (or count_limit is NULL), otherwise it is a lower bound
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS puzzles ("
+            "puzzle TEXT PRIMARY KEY, solution TEXT, solution_count INTEGER, count_limit INTEGER, rating REAL)")
+        self.connection.commit()
+
+    def count_solutions(self, values, limit=2):
+        """
+        counts the solutions of the 9x9 nested list up to limit (None for all) like BackgroundBoardNbN.count_solutions,
+        stored counts that already answer the question skip the search
+        """
+        canonical, _, _ = canonicalize(values)
+        row = self._get_row(canonical)
+        if row is not None and row[1] is not None:
+            _, solution_count, count_limit, _ = row
+            if count_limit is None or solution_count < count_limit:  # the stored count is exact
+                self.hits += 1
+                return solution_count if limit is None else min(solution_count, limit)
+            if limit is not None and solution_count >= limit:
+                self.hits += 1
+                return limit
+        self.misses += 1
+        solution = None
+        solution_count = 0
+        solutions = DancingLinks(_get_values(canonical)).iter_solutions()
+        try:
+            for values_found in solutions:
+                if solution is None:
+                    solution = "".join(str(value) for row_values in values_found for value in row_values)
+                solution_count += 1
+                if limit is not None and solution_count >= limit:
+                    break
+        finally:
+            solutions.close()
+        self._update_row(canonical, solution=solution, solution_count=solution_count, count_limit=limit)
+        return solution_count
+
+    def solve(self, values):
+        """returns a solution of the 9x9 nested list as a 9x9 nested list or None if it has none"""
+        canonical, cell_order, digit_map = canonicalize(values)
+        row = self._get_row(canonical)
+        if row is not None and (row[0] is not None or row[1] == 0):
+            self.hits += 1
+            solution = row[0]
+        else:
+            self.misses += 1
+            values_found = DancingLinks(_get_values(canonical)).solve()
+            if values_found is None:
+                solution = None
+                self._update_row(canonical, solution_count=0, count_limit=None)
+            else:
+                solution = "".join(str(value) for row_values in values_found for value in row_values)
+                self._update_row(canonical, solution=solution)
+        if solution is None:
+            return None
+        return uncanonicalize(solution, cell_order, digit_map)
+
+    def get_rating(self, values):
+        """returns the stored rating of the 9x9 nested list or None"""
+        row = self._get_row(canonicalize(values)[0])
+        return None if row is None else row[3]
+
+    def set_rating(self, values, rating):
+        self._update_row(canonicalize(values)[0], rating=rating)
+
+    def close(self):
+        self.connection.close()
+
+    def _get_row(self, canonical):
+        return self.connection.execute(
+            "SELECT solution, solution_count, count_limit, rating FROM puzzles WHERE puzzle = ?",
+            (canonical,)).fetchone()
+
+    def _update_row(self, canonical, **columns):
+        """writes the passed in columns of the puzzle's row, the row gets created if it doesn't exist yet"""
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO puzzles (puzzle) VALUES (?)", (canonical,))
+            self.connection.execute(
+                f"UPDATE puzzles SET {', '.join(f'{name} = ?' for name in columns)} WHERE puzzle = ?",
+                (*columns.values(), canonical))
+
+
+def _get_values(canonical):
+    return [[int(ch) for ch in canonical[row_index * 9:row_index * 9 + 9]] for row_index in range(9)]
@@ -0,0 +1,75 @@
+"""
+Index tables of the boards. Cells are numbered row by row, cell i of an n x n board sits in row i // n and col i % n.
+Units are numbered rows 0 - (n - 1), cols n - (2n - 1) and boxes 2n - (3n - 1), boxes row by row.
+get_geometry builds the tables of every BoardType once, the module level tables are the ones of the 9x9 board.
+"""
+from functools import lru_cache
+
+from Solver_v3.core.enums import BoardType, get_box_shape
+
+
+class BoardGeometry:
+
+    def __init__(self, board_type=BoardType.NINE_X_NINE):
+        self.board_type = board_type
+        self.box_height, self.box_width = get_box_shape(board_type)
+        n = self.size = board_type.value
+        self.cell_count = n * n
+        self.all_digits = (1 << n) - 1  # the pV_mask of a cell that can still hold every digit
+
+        self.row_of = tuple(i // n for i in range(self.cell_count))
+        self.col_of = tuple(i % n for i in range(self.cell_count))
+        # a band holds box_height rows and box_height boxes (n // box_width), a stack box_width cols and boxes
+        self.box_of = tuple((self.row_of[i] // self.box_height) * self.box_height + self.col_of[i] // self.box_width
+                            for i in range(self.cell_count))
+
+        self.rows = tuple(tuple(i for i in range(self.cell_count) if self.row_of[i] == r) for r in range(n))
+        self.cols = tuple(tuple(i for i in range(self.cell_count) if self.col_of[i] == c) for c in range(n))
+        self.boxes = tuple(tuple(i for i in range(self.cell_count) if self.box_of[i] == b) for b in range(n))
+
+        # units[u] holds the n cells of unit u
+        self.units = self.rows + self.cols + self.boxes
+
+        # cell_units[i] holds the row, col and box unit of cell i
+        self.cell_units = tuple((self.row_of[i], n + self.col_of[i], 2 * n + self.box_of[i])
+                                for i in range(self.cell_count))
+
+        # peers[i] holds the other cells sharing a row, col or box with cell i, in ascending order
+        self.peers = tuple(
+            tuple(sorted({p for u in self.cell_units[i] for p in self.units[u]} - {i}))
+            for i in range(self.cell_count))
+
+        # Position masks of the cells a box shares with a line. Box positions are numbered row by row (bit
+        # box_width * r + c), line positions run along the line, so row_box_masks[k] are the cells a row shares with
+        # its k-th box and col_box_masks[k] the cells a col shares with its k-th box
+        self.box_row_masks = tuple(((1 << self.box_width) - 1) << (self.box_width * r) for r in range(self.box_height))
+        self.box_col_masks = tuple(sum(1 << (self.box_width * r + c) for r in range(self.box_height))
+                                   for c in range(self.box_width))
+        self.row_box_masks = tuple(((1 << self.box_width) - 1) << (self.box_width * k) for k in range(self.box_height))
+        self.col_box_masks = tuple(((1 << self.box_height) - 1) << (self.box_height * k) for k in range(self.box_width))
+
+
+@lru_cache(maxsize=None)
+def get_geometry(board_type=BoardType.NINE_X_NINE):
+    """returns the BoardGeometry of the board type, every board of a type shares it"""
+    return BoardGeometry(board_type)
+
+
+NINE_X_NINE = get_geometry(BoardType.NINE_X_NINE)
+
+ROW_OF = NINE_X_NINE.row_of
+COL_OF = NINE_X_NINE.col_of
+BOX_OF = NINE_X_NINE.box_of
+
+ROWS = NINE_X_NINE.rows
+COLS = NINE_X_NINE.cols
+BOXES = NINE_X_NINE.boxes
+
+# UNITS[u] holds the 9 cells of unit u
+UNITS = NINE_X_NINE.units
+
+# CELL_UNITS[i] holds the row, col and box unit of cell i
+CELL_UNITS = NINE_X_NINE.cell_units
+
+# PEERS[i] holds the 20 other cells sharing a row, col or box with cell i, in ascending order
+PEERS = NINE_X_NINE.peers
@@ -1,4 +1,4 @@
-import copy
+import os
 import time
 from io import BytesIO
 
@@ -20,6 +20,11 @@ import customtkinter as ctk
 import random
 
 from Solver_v3.Utils import Difficulty, SolveType, Algorithm, ValueLabel, CellChange, BoardType
+from Solver_v3.core import BackgroundBoardNbN, BackgroundSolver as CoreBackgroundSolver, \
+    BackgroundGenerator as CoreBackgroundGenerator, Metrics
+from Solver_v3.core.bitmask import DIGIT_BIT
+from Solver_v3.core.store import SolutionStore
+from Solver_v3.core.tables import BOX_OF, CELL_UNITS
 from Themes.colors import color_dict as cd
 
 ctk.set_appearance_mode("dark")
@@ -95,6 +100,9 @@ class Board9x9(Board):
         self.cell_rows = []  # Never needs to be updated
         self.cell_cols = [[] for _ in range(9)]  # Never needs to be updated
         self.cell_boxes = [[] for _ in range(9)]  # Never needs to be updated
+        # values placed in every row, col and box (unit numbers of the index tables) and how many cells hold each
+        self.unit_masks = [0] * 27
+        self.unit_counts = [[0] * 10 for _ in range(27)]
         # all resolved cells
         self.resolved_cells = []
         self.cell_rows_resolved = []
@@ -138,6 +146,10 @@ class Board9x9(Board):
     def isUniquelySolvable(self):
         return self.main_gui.background_solver.isBoardUniquelySolvable
 
+    @property
+    def isSolvableByElimination(self):
+        return self.main_gui.background_solver.isBoardSolvableByElimination
+
     def construct_board(self):
         # Create 9 frames.
         self.board_box_frames = [[ctk.CTkFrame(
@@ -163,7 +175,8 @@ class Board9x9(Board):
                     board=self,
                     containing_row=cell_row,
                     containing_col=self.cell_cols[j],
-                    containing_box=self.cell_boxes[(i // 3) * 3 + j // 3],
+                    containing_box=self.cell_boxes[BOX_OF[i * 9 + j]],
+                    index=i * 9 + j,
                     text="",
                     font=("Arial", 50),
                     text_color=cd["tc_for_when_cell_is_empty"],
@@ -181,7 +194,7 @@ class Board9x9(Board):
                 self.cells.append(cell)
                 cell_row.append(cell)
                 self.cell_cols[j].append(cell)
-                self.cell_boxes[(i // 3) * 3 + j // 3].append(cell)
+                self.cell_boxes[BOX_OF[i * 9 + j]].append(cell)
             self.cell_rows.append(cell_row)
 
     def clear_board(self):
@@ -191,7 +204,11 @@ class Board9x9(Board):
         self.main_gui.reductions_checked_label.value = 0
         self.main_gui.reductions_by_constellation_label.value = 0
         self.main_gui.reductions_by_sudoku_label.value = 0
+        self.main_gui.reductions_by_hidden_subsets_label.value = 0
+        self.main_gui.reductions_by_locked_candidates_label.value = 0
+        self.main_gui.reductions_by_fish_label.value = 0
         self.main_gui.constellations_checked_label.value = 0
+        self.main_gui.metrics.reset()
         for index, cell in enumerate(self.cells):
             cell.clear_value()  # We clear every cell to also reset every possible values that might still be linguering
             # set progress bar
@@ -207,7 +224,13 @@ class Board9x9(Board):
         self.main_gui.recursions_checked_label.value = 0
         self.main_gui.reductions_by_constellation_label.value = 0
         self.main_gui.reductions_by_sudoku_label.value = 0
+        self.main_gui.reductions_by_hidden_subsets_label.value = 0
+        self.main_gui.reductions_by_locked_candidates_label.value = 0
+        self.main_gui.reductions_by_fish_label.value = 0
         self.main_gui.constellations_checked_label.value = 0
+        self.main_gui.metrics.reset(names=("recursions_checked", "reductions_by_constellations", "reductions_by_sudoku",
+                                           "reductions_by_hidden_subsets", "reductions_by_locked_candidates",
+                                           "reductions_by_fish", "constellations_checked"))
         self.selected_cell = None
         resolved_cell_count = len(self.resolved_cells)  # For progress
         for i, c in enumerate(self.resolved_cells):
@@ -244,12 +267,12 @@ class Board9x9(Board):
                     self.unresolved_cells.append(cell)
                     cell_row_unresolved.append(cell)
                     self.cell_cols_unresolved[index_col].append(cell)
-                    self.cell_boxes_unresolved[(index_row // 3) * 3 + index_col // 3].append(cell)
+                    self.cell_boxes_unresolved[BOX_OF[index_row * 9 + index_col]].append(cell)
                 elif cell.isResolved:
                     self.resolved_cells.append(cell)
                     cell_row_resolved.append(cell)
                     self.cell_cols_resolved[index_col].append(cell)
-                    self.cell_boxes_resolved[(index_row // 3) * 3 + index_col // 3].append(cell)
+                    self.cell_boxes_resolved[BOX_OF[index_row * 9 + index_col]].append(cell)
                 else:
                     self.given_cells.append(cell)
             self.cell_rows_unresolved.append(cell_row_unresolved)
@@ -271,7 +294,8 @@ class Board9x9(Board):
 
 class Cell(ctk.CTkButton):
 
-    def __init__(self, board: Board9x9, containing_row, containing_col, containing_box, master: Any, **kwargs):
+    def __init__(self, board: Board9x9, containing_row, containing_col, containing_box, index, master: Any,
+                 **kwargs):
         super().__init__(master, **kwargs)
         self.value = None
         self._isSelected = False
@@ -285,12 +309,9 @@ class Cell(ctk.CTkButton):
         self.containing_row = containing_row
         self.containing_col = containing_col
         self.containing_box = containing_box
+        self.units = CELL_UNITS[index]  # the row, col and box numbers of the board's unit masks
 
-        match board.board_type:
-            case BoardType.NINE_X_NINE:
-                self.possible_values = {pV for pV in range(1, 10)}
-            case BoardType.SIX_X_SIX:
-                self.possible_values = {pV for pV in range(1, 7)}
+        self.possible_values = {pV for pV in range(1, board.board_type.value + 1)}
 
     @property
     def isSelected(self):
@@ -352,7 +373,10 @@ class Cell(ctk.CTkButton):
     def set_given_value(self, value):
         if not self.isGiven:
             self.board_stats_handler(change_state=CellChange.UNRESOLVED_TO_GIVEN)
+        if self.value is not None:
+            self.vacate_units()
         self.value = value
+        self.occupy_units()
         self.possible_values = {value}
         self.isGiven = True
         self.isUnresolved = False
@@ -371,7 +395,10 @@ class Cell(ctk.CTkButton):
     def set_resolved_value(self, value):
         if not self.isResolved:
             self.board_stats_handler(change_state=CellChange.UNRESOLVED_TO_RESOLVED)
+        if self.value is not None:
+            self.vacate_units()
         self.value = value
+        self.occupy_units()
         self.possible_values = {value}
         self.isGiven = False
         self.isUnresolved = False
@@ -392,8 +419,10 @@ class Cell(ctk.CTkButton):
             self.board_stats_handler(CellChange.GIVEN_TO_UNRESOLVED)
         elif self.isResolved:
             self.board_stats_handler(CellChange.RESOLVED_TO_UNRESOLVED)
+        if self.value is not None:
+            self.vacate_units()
         self.value = None
-        self.possible_values = {pV for pV in range(1, 10)}
+        self.possible_values = {pV for pV in range(1, self.board_type.value + 1)}
         self.isGiven = False
         self.isUnresolved = True
         self.isResolved = False
@@ -424,159 +453,33 @@ class Cell(ctk.CTkButton):
 
     def is_valid(self, value):
         """returns whether the value would be valid for this cell or not"""
-        return not any(
-            value in lst for lst in [[cell.value for cell in self.containing_row],
-                                     [cell.value for cell in self.containing_col],
-                                     [cell.value for cell in self.containing_box]]
-        )
-
-
-class BackgroundBoardNbN:
-
-    def __init__(self, board: Board9x9):
-        self.og_board = board
-        self.cells = []
-        self.cell_rows = []
-        self.cell_cols = [[] for _ in range(9)]
-        self.cell_boxes = [[] for _ in range(9)]
-        for row_index, row in enumerate(board.cell_rows):
-            cell_row = []
-            for col_index, cell in enumerate(row):
-                bg_cell = BackgroundCell(
-                    c_row=cell_row,
-                    c_col=self.cell_cols[col_index],
-                    c_box=self.cell_boxes[(row_index // 3) * 3 + col_index // 3],
-                    cell=cell)
-                self.cells.append(bg_cell)
-                cell_row.append(bg_cell)
-                self.cell_cols[col_index].append(bg_cell)
-                self.cell_boxes[(row_index // 3) * 3 + col_index // 3].append(bg_cell)
-            self.cell_rows.append(cell_row)
-
-    @property
-    def isSolved(self):
-        # checks if the board has any unresolved values left
-        if len([c for c in self.cells if not c.isResolved]) != 0:
-            return False
-        # checks if every cells value only appears once in every row, col and box containing the cell
-        for cell in self.cells:
-            if sum([
-                [c.value for c in cell.c_row].count(cell.value),
-                [c.value for c in cell.c_col].count(cell.value),
-                [c.value for c in cell.c_box].count(cell.value)
-            ]) != 3:
-                return False
-        return True
-
-    @property
-    def isUniquelySolvable(self):
-        snap_shot = [c.value for c in self.cells]
-        isSolvable = BackgroundSolver(main_gui=self.og_board.main_gui).check_if_bg_board_is_uniquely_solvable(bg_board=self)
-        for i, val in enumerate(snap_shot):
-            if val:
-                self.cells[i].set_value(val)
-            else:
-                self.cells[i].clear_value()
-        return isSolvable
-
-    def clear_bg_board(self):
-        for c in self.cells:
-            c.clear_value()
-
-    def print_board(self):
-        for row in self.cell_rows:
-            print([cell.value for cell in row])
-
-    def get_unresolved_cells(self):
-        unresolved_cells = []
-        for row in self.cell_rows:
-            for cell in row:
-                if not cell.isResolved:
-                    unresolved_cells.append(cell)
-        return unresolved_cells
-
-    def solve_alg_backtracking(self):
-        """try all possible values"""
-        unresolved_cells = self.get_unresolved_cells()
-        for unresolved_cell in unresolved_cells:
-            for num in unresolved_cell.possible_values:
-                if unresolved_cell.is_valid(num):
-                    unresolved_cell.set_value(num)
-                    if self.solve_alg_backtracking():
-                        return True
-                    unresolved_cell.clear_value()
-            return False
-        return True
-
-    def reduce_all_possible_values(self):
-        """reduction by soduko"""
-        unresolved_cells = self.get_unresolved_cells()
-        for unresolved_cell in unresolved_cells:
-            pVs_for_unresolved_cell = {}
-            for pV in range(1, 10):
-                if unresolved_cell.is_valid(pV):
-                    pVs_for_unresolved_cell |= {pV}
-            unresolved_cell.possible_values = pVs_for_unresolved_cell
-
-    def print_back_to_og_board(self):
-        for row_index, og_row in enumerate(self.og_board.cell_rows):
-            for col_index, og_cell in enumerate(og_row):
-                if self.cell_rows[row_index][col_index].isResolved and not self.og_board.cell_rows[row_index][
-                    col_index].isGiven:
-                    og_cell.set_resolved_value(value=self.cell_rows[row_index][col_index].value)
-
-    def print_back_to_og_board_as_given(self):
-        for row_index, og_row in enumerate(self.og_board.cell_rows):
-            for col_index, og_cell in enumerate(og_row):
-                if self.cell_rows[row_index][col_index].isResolved:
-                    og_cell.set_given_value(value=self.cell_rows[row_index][col_index].value)
-
-
-class BackgroundCell:
-
-    def __init__(self, c_row, c_col, c_box, cell):
-        self.c_row = c_row
-        self.c_col = c_col
-        self.c_box = c_box
-        self.value = copy.deepcopy(cell.value)
-        self.isResolved = False if cell.isUnresolved else True
-        self.possible_values = copy.deepcopy(cell.possible_values)
-
-    def reduce_possible_values(self, values):
-        self.possible_values -= values
-        if len(self.possible_values) == 1:
-            self.value = list(self.possible_values)[0]
-            self.isResolved = True
+        unit_masks = self.board.unit_masks
+        row, col, box = self.units
+        return not (unit_masks[row] | unit_masks[col] | unit_masks[box]) & DIGIT_BIT[value]
 
+    def occupy_units(self):
+        """marks the cell's value as placed in its row, col and box"""
+        for u in self.units:
+            self.board.unit_masks[u] |= DIGIT_BIT[self.value]
+            self.board.unit_counts[u][self.value] += 1
 
-    def clear_value(self):
-        self.value = None
-        self.isResolved = False
-        self.possible_values = {pV for pV in range(1, 10)}
+    def vacate_units(self):
+        """unmarks the cell's value in its row, col and box, unless another cell of the unit still holds it"""
+        for u in self.units:
+            self.board.unit_counts[u][self.value] -= 1
+            if not self.board.unit_counts[u][self.value]:
+                self.board.unit_masks[u] &= ~DIGIT_BIT[self.value]
 
-    def set_value(self, value):
-        self.value = value
-        self.isResolved = True
-        self.possible_values = {value}
-
-    def is_valid(self, value):
-        """returns True if the digit is valid"""
-        return not any(
-            value in lst for lst in [[cell.value for cell in self.c_row],
-                                     [cell.value for cell in self.c_col],
-                                     [cell.value for cell in self.c_box]]
-        )
 
-
-class BackgroundSolver:
+class BackgroundSolver(CoreBackgroundSolver):
 
     def __init__(self, main_gui):
         self.main_gui = main_gui
-        self.bg_board = BackgroundBoardNbN(main_gui.board)
-        self.reductions_by_sudoku = 0
-        self.reductions_by_constellations = 0
-        self.constellations_checked = 0
-        self.recursions_checked = 0
+        super().__init__(bg_board=BackgroundBoardNbN(main_gui.board), solution_store=main_gui.solution_store,
+                         metrics=main_gui.metrics)
+        # the board the steps run on, separate from bg_board since the stats refresh fetches a new bg_board
+        self.step_board = None
+        self.step_algorithm = None
 
     def update_board(self):
         """
@@ -584,193 +487,39 @@ class BackgroundSolver:
         """
         self.bg_board = BackgroundBoardNbN(self.main_gui.board)
 
-    def check_if_bg_board_is_uniquely_solvable(self, bg_board):
-        iterations_without_change = 0
-        while iterations_without_change < 4:
-            board_before = [c.value for c in bg_board.cells]
-            for bg_cell in bg_board.cells:
-                if bg_cell.isResolved:
-                    continue
-                else:
-                    self.reduction_by_constellation_set(bg_cell.c_row)
-                    self.reduction_by_constellation_set(bg_cell.c_col)
-                    self.reduction_by_constellation_set(bg_cell.c_box)
-            board_after = [c.value for c in bg_board.cells]
-            if board_before == board_after:
-                iterations_without_change += 1
-            else:
-                iterations_without_change = 0
-        return bg_board.isSolved
-
-
     @property
     def isBoardUniquelySolvable(self):
         self.update_board()
-        iterations_without_change = 0
-        while iterations_without_change < 4:
-            board_before = [c.value for c in self.bg_board.cells]
-            for bg_cell in self.bg_board.cells:
-                if bg_cell.isResolved:
-                    continue
-                else:
-                    self.reduction_by_constellation_set(bg_cell.c_row)
-                    self.reduction_by_constellation_set(bg_cell.c_col)
-                    self.reduction_by_constellation_set(bg_cell.c_box)
-            board_after = [c.value for c in self.bg_board.cells]
-            if board_before == board_after:
-                iterations_without_change += 1
-            else:
-                iterations_without_change = 0
-        return self.bg_board.isSolved
+        return super().isBoardUniquelySolvable
 
-    def solve(self):
+    @property
+    def isBoardSolvableByElimination(self):
+        self.update_board()
+        return super().isBoardSolvableByElimination
+
+    def solve(self, algorithm=None):
         self.update_board()
         self.main_gui.board.selected_cell = None  # Just to handle the decoloration in case a cell is selected
-        self.reductions_by_sudoku = 0
-        self.reductions_by_constellations = 0
-        self.constellations_checked = 0
-        self.recursions_checked = 0
-        match self.main_gui.selected_solving_algorithm:
-            case Algorithm.SOLVING.ELIMINATION_BY_CONSTELLATION:
-                if self.isBoardUniquelySolvable:
-                    self.reduction_by_constellation()
-            case Algorithm.SOLVING.ELIMINATION_OPTIMIZED:
-                if self.isBoardUniquelySolvable:
-                    self.reduction_by_constellation_optimized()
-            case Algorithm.SOLVING.BACKTRACKING:
-                self.backtracking()
-            case Algorithm.SOLVING.BACKTRACKING_OPTIMIZED:
-                self.reduction_by_sudoku()
-                self.backtracking()
-            case Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING:
-                self.reduction_by_constellation_plus_backtracking()
-        self.main_gui.recursions_checked_label.value = self.recursions_checked
-        self.main_gui.reductions_by_sudoku_label.value = self.reductions_by_sudoku
-        self.main_gui.reductions_by_constellation_label.value = self.reductions_by_constellations
-        self.main_gui.constellations_checked_label.value = self.constellations_checked
+        super().solve(algorithm=algorithm or self.main_gui.selected_solving_algorithm)  # publishes the counters
         self.bg_board.print_back_to_og_board()
         self.main_gui.board.update_UI_stats()
 
-    def backtracking(self):
-        print("backtracking")
-        unresolved_cells = [bgc for bgc in self.bg_board.cells if not bgc.isResolved]
-        for bgc in unresolved_cells:
-            for value in bgc.possible_values:
-                if bgc.is_valid(value=value):
-                    bgc.set_value(value=value)
-                    self.recursions_checked += 1
-                    unresolved_cells.remove(bgc)
-                    if self.backtracking():
-                        return True
-                    bgc.clear_value()
-                    unresolved_cells.append(bgc)
-            return False
-        return True
-
-    def reduction_by_constellation(self):
-        while not self.bg_board.isSolved:
-            for bgC in self.bg_board.cells:
-                # print(f"bg_cell: {bg_cell.value}, c_row: {[c.value for c in bg_cell.c_row]}")
-                if bgC.isResolved:
-                    continue
-                else:
-                    self.reduction_by_constellation_set(bgCs=bgC.c_row)
-                    self.reduction_by_constellation_set(bgCs=bgC.c_col)
-                    self.reduction_by_constellation_set(bgCs=bgC.c_box)
-
-    def reduction_by_constellation_optimized(self):
-        while not self.bg_board.isSolved:
-            self.reduction_by_sudoku()
-            for row in [[c for c in self.bg_board.cell_rows[j] if not c.isResolved] for j in range(9)]:
-                self.reduction_by_constellation_optimized_set(cell_set=row)
-            for col in [[c for c in self.bg_board.cell_cols[j] if not c.isResolved] for j in range(9)]:
-                self.reduction_by_constellation_optimized_set(cell_set=col)
-            for box in [[c for c in self.bg_board.cell_boxes[j] if not c.isResolved] for j in range(9)]:
-                self.reduction_by_constellation_optimized_set(cell_set=box)
-
-    def reduction_by_sudoku(self):
-        rbgCs = [bgc for bgc in self.bg_board.cells if bgc.isResolved]  # get all resolved cells
-        for rbgC in rbgCs:
-            ubgCs = self.get_unresolved_cells_in_rcb(
-                rbgC)  # get a set of unresolved cells in the same row, col and box of the resolved or given cells
-            for ubgC in ubgCs:  # Reduce the unresolved cell's pVs by the value of the resolved or given cell
-                b4 = len(ubgC.possible_values)
-                ubgC.reduce_possible_values({rbgC.value})
-                aftr = len(ubgC.possible_values)
-                self.reductions_by_sudoku += b4 - aftr
-                if ubgC.isResolved:
-                    rbgCs.append(ubgC)
-        if self.bg_board.isSolved:  # This check gets done in case we solve the board with only this method
-            return
-
-    def get_unresolved_cells_in_rcb(self, cell):
+    def solve_step(self, until=None):
         """
-        cell passed in here should be resolved or given.
-        Returns a set of all cells in the same row, col and box as the passed in cell
+        solves until the next digit / reduction (main_gui.solve_until by default) and prints the changed cells back.
+        The steps resume between calls, they only start over from a new copy of the main board once it got edited
+        or another algorithm got selected
         """
-        return {cell for lst in [cell.c_row,
-                                 cell.c_col,
-                                 cell.c_box] for cell in lst if not cell.isResolved}
-
-    def reduction_by_constellation_set(self, bgCs):  # This function is currently used to determine a boards solvability
-        """bg_cells is a set of nine BackgroundCells"""
-        if bgCs:
-            possible_constellations = list()
-            # get all possible combinations
-            for size in range(1, 9):
-                possible_constellations += combinations(bgCs, size)
-            for constellation in possible_constellations:
-                self.constellations_checked += 1
-                shared_pVs = set()
-                for bgc in constellation:
-                    shared_pVs |= bgc.possible_values
-                if len(shared_pVs) == len(constellation):
-                    for bgcR in bgCs:
-                        if bgcR not in constellation and not bgcR.isResolved:
-                            # b4 = len(bgcR.possible_values)
-                            bgcR.reduce_possible_values(shared_pVs)
-                            # aftr = len(bgcR.possible_values)
-                            # self.main_gui.reductions_by_constellation.value += b4 - aftr
-
-    def reduction_by_constellation_optimized_set(self, cell_set):
-        cell_set = [bgc for bgc in cell_set if not bgc.isResolved]
-        if cell_set:
-            min_con_size = min(
-                [len(bgc.possible_values) for bgc in cell_set])
-            max_con_size = len(cell_set)
-            possible_constellations = list()
-            for size in range(min_con_size, max_con_size):
-                possible_constellations += combinations(cell_set, size)
-            for constellation in possible_constellations:
-                self.constellations_checked += 1
-                shared_pVs = set()
-                for bgc in constellation:
-                    shared_pVs |= bgc.possible_values
-                if len(shared_pVs) == len(constellation):
-                    for bgcR in cell_set:
-                        if bgcR not in constellation and not bgcR.isResolved:
-                            b4 = len(bgcR.possible_values)
-                            bgcR.reduce_possible_values(shared_pVs)
-                            aftr = len(bgcR.possible_values)
-                            self.reductions_by_constellations += b4 - aftr
-
-    def reduction_by_constellation_plus_backtracking(self):
-        print("new alg")
-        board_b4 = 0
-        board_aftr = 1
-        while board_b4 != board_aftr:
-            board_b4 = [c.value for c in self.bg_board.cells]
-            self.reduction_by_sudoku()
-            for row in [[c for c in self.bg_board.cell_rows[j] if not c.isResolved] for j in range(9)]:
-                self.reduction_by_constellation_optimized_set(cell_set=row)
-            for col in [[c for c in self.bg_board.cell_cols[j] if not c.isResolved] for j in range(9)]:
-                self.reduction_by_constellation_optimized_set(cell_set=col)
-            for box in [[c for c in self.bg_board.cell_boxes[j] if not c.isResolved] for j in range(9)]:
-                self.reduction_by_constellation_optimized_set(cell_set=box)
-            board_aftr = [c.value for c in self.bg_board.cells]
-        self.reduction_by_sudoku()
-        print("red by sudoku fired")
-        self.backtracking()
+        algorithm = self.main_gui.selected_solving_algorithm
+        og_values = [[og_cell.value for og_cell in og_row] for og_row in self.main_gui.board.cell_rows]
+        if self.steps is None or self.step_algorithm is not algorithm or self.step_board.get_values() != og_values:
+            self.step_board = BackgroundBoardNbN(self.main_gui.board)
+            self.step_algorithm = algorithm
+            self.start_steps(algorithm=algorithm, bg_board=self.step_board)
+        self.main_gui.board.selected_cell = None
+        changed_cells = self.next_step(until=until or self.main_gui.solve_until)
+        self.step_board.print_cells_back_to_og_board(changed_cells)
+        self.main_gui.board.update_UI_stats()
 
 
 class Solver:
@@ -783,10 +532,10 @@ class Solver:
         self.board.selected_cell = None
         match self.main_gui.selected_solving_algorithm:
             case Algorithm.SOLVING.ELIMINATION_BY_CONSTELLATION:
-                if self.board.isUniquelySolvable:
+                if self.board.isSolvableByElimination:
                     self.reduction_by_constellation()
             case Algorithm.SOLVING.ELIMINATION_OPTIMIZED:
-                if self.board.isUniquelySolvable:
+                if self.board.isSolvableByElimination:
                     self.reduction_by_constellation_optimized()
             case Algorithm.SOLVING.BACKTRACKING:
                 self.board.update_all_board_references()
@@ -800,6 +549,10 @@ class Solver:
                 self.backtracking(unresolved_cells=self.board.unresolved_cells)
             case Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING:
                 self.reduction_by_constellation_plus_backtracking()
+            case Algorithm.SOLVING.BACKTRACKING_MRV | Algorithm.SOLVING.DANCING_LINKS:
+                # These only exist in the background, the board gets printed back once they are done
+                self.main_gui.background_solver.solve(algorithm=self.main_gui.selected_solving_algorithm)
+        self.main_gui.metrics.publish(force=True)  # the last counts might have fallen into the sampling interval
         self.board.update_UI_stats()
 
     def backtracking(self, unresolved_cells):
@@ -807,7 +560,8 @@ class Solver:
             for value in c.possible_values:
                 if c.is_valid(value=value):
                     c.set_resolved_value(value=value)
-                    self.main_gui.recursions_checked_label.value += 1
+                    self.main_gui.metrics.increment("recursions_checked")
+                    self.main_gui.metrics.publish()
                     unresolved_cells.remove(c)
                     if self.backtracking(unresolved_cells=unresolved_cells):
                         return True
@@ -867,7 +621,8 @@ class Solver:
                 progress = i / (len(rgCs) - 1)
                 alg_progress_bar_handler(main_gui=self.main_gui, progress=progress)
                 aftr = len(uC.possible_values)
-                self.main_gui.reductions_by_sudoku_label.value += b4 - aftr
+                self.main_gui.metrics.increment("reductions_by_sudoku", b4 - aftr)
+                self.main_gui.metrics.publish()
                 if uC.isResolved:
                     rgCs.append(uC)
             if rgC is not self.board.selected_cell:
@@ -894,7 +649,8 @@ class Solver:
             for size in range(min_con_size, max_con_size):
                 possible_constellations += combinations(cell_set, size)
             for constellation in possible_constellations:
-                self.main_gui.constellations_checked_label.value += 1
+                self.main_gui.metrics.increment("constellations_checked")
+                self.main_gui.metrics.publish()
                 shared_pVs = set()
                 for c in constellation:
                     if c is not self.board.selected_cell:
@@ -918,7 +674,8 @@ class Solver:
                             b4 = len(cR.possible_values)
                             cR.reduce_possible_values(shared_pVs)
                             aftr = len(cR.possible_values)
-                            self.main_gui.reductions_by_constellation_label.value += b4 - aftr
+                            self.main_gui.metrics.increment("reductions_by_constellations", b4 - aftr)
+                            self.main_gui.metrics.publish()
                 else:
                     for c in constellation:
                         if c is not self.board.selected_cell:
@@ -934,7 +691,8 @@ class Solver:
             for size in range(1, 9):
                 possible_constellations += combinations(cell_set, size)
             for constellation in possible_constellations:
-                self.main_gui.constellations_checked_label.value += 1
+                self.main_gui.metrics.increment("constellations_checked")
+                self.main_gui.metrics.publish()
                 shared_pVs = set()
                 for c in constellation:
                     if c is not self.board.selected_cell:
@@ -958,7 +716,8 @@ class Solver:
                             b4 = len(cR.possible_values)
                             cR.reduce_possible_values(shared_pVs)
                             aftr = len(cR.possible_values)
-                            self.main_gui.reductions_by_constellation_label.value += b4 - aftr
+                            self.main_gui.metrics.increment("reductions_by_constellations", b4 - aftr)
+                            self.main_gui.metrics.publish()
                 else:
                     for c in constellation:
                         if c is not self.board.selected_cell:
@@ -1011,10 +770,12 @@ class Generator:
         self.main_gui.current_alg_type = Algorithm.GENERATING.FILLING
         self.fill_board_by_backtracking()
         self.standard_reduction()
+        self.main_gui.metrics.publish(force=True)
         self.board.update_UI_stats()
 
     def fill_board_by_backtracking(self):
-        self.main_gui.recursions_made_label.value += 1
+        self.main_gui.metrics.increment("recursions_made")
+        self.main_gui.metrics.publish()
         for c in self.board.cells:
             if c.isUnresolved:
                 rVs = list(range(1, 10))
@@ -1037,7 +798,8 @@ class Generator:
             random.shuffle(gCs)
             board_b4 = [c.value for c in self.board.cells]
             for gC in gCs:  # Remove cell values one by one
-                self.main_gui.reductions_checked_label.value += 1
+                self.main_gui.metrics.increment("reductions_checked")
+                self.main_gui.metrics.publish()
                 if given_digits == goal_digit_count:  # until digit count is met
                     self.main_gui.current_alg_type = None
                     return
@@ -1132,11 +894,12 @@ class Generator:
             print(row)
 
 
-class BackgroundGenerator:
+class BackgroundGenerator(CoreBackgroundGenerator):
 
     def __init__(self, main_gui):
         self.main_gui = main_gui
-        self.bg_board = BackgroundBoardNbN(main_gui.board)
+        super().__init__(bg_board=BackgroundBoardNbN(main_gui.board), solution_store=main_gui.solution_store,
+                         metrics=main_gui.metrics)
 
     def update_board(self):
         """
@@ -1144,63 +907,15 @@ class BackgroundGenerator:
         """
         self.bg_board = BackgroundBoardNbN(self.main_gui.board)
 
-    def generate(self):
+    def generate(self, difficulty=None):
         self.bg_board.og_board.clear_board()
         self.update_board()
-        self.fill_board_by_backtracking()
-        self.standard_reduction()
+        self.main_gui.current_alg_type = Algorithm.GENERATING.REDUCING
+        super().generate(difficulty=difficulty or self.main_gui.difficulty)
+        self.main_gui.current_alg_type = None
         self.bg_board.print_back_to_og_board_as_given()
         self.main_gui.board.update_UI_stats()
 
-    def fill_board_by_backtracking(self):
-        self.main_gui.recursions_made_label.value += 1
-        for c in self.bg_board.cells:
-            if not c.isResolved:
-                rVs = list(range(1, 10))
-                random.shuffle(rVs)
-                for rV in rVs:
-                    if c.is_valid(rV):
-                        c.set_value(rV)
-                        if self.fill_board_by_backtracking():
-                            return True
-                        c.clear_value()
-                return False
-        return True
-
-    def standard_reduction(self):
-        self.main_gui.current_alg_type = Algorithm.GENERATING.REDUCING
-        goal_digit_count = self.get_difficulty_range()
-        given_digits = 81
-        while given_digits != goal_digit_count:
-            rbgCs = [bgC for bgC in self.bg_board.cells if bgC.isResolved]
-            random.shuffle(rbgCs)
-            board_b4 = [c.value for c in self.bg_board.cells]
-            for rbgC in rbgCs:  # Remove cell values one by one
-                self.main_gui.reductions_checked_label.value += 1
-                if given_digits == goal_digit_count:  # until digit count is met
-                    self.main_gui.current_alg_type = None
-                    return
-                rmvd_val = rbgC.value
-                rbgC.clear_value()
-                given_digits -= 1
-                if not self.bg_board.isUniquelySolvable:  # Check if the board is still solvable
-                    rbgC.set_value(rmvd_val)
-                    given_digits += 1
-            board_aftr = [bgC.value for bgC in self.bg_board.cells]
-            if board_b4 == board_aftr:  # Break when the board hasn't changed
-                break
-
-    def get_difficulty_range(self):
-        match self.main_gui.difficulty:
-            case Difficulty.EASY:
-                return random.randrange(39, 43)
-            case Difficulty.MEDIUM:
-                return random.randrange(34, 38)
-            case Difficulty.HARD:
-                return random.randrange(29, 33)
-            case Difficulty.EXTREME:
-                return random.randrange(19, 23)
-
 
 class MainGUI:
 
@@ -1224,6 +939,12 @@ class MainGUI:
         self.main_frame.rowconfigure(1, weight=7)
         self.main_frame.pack(fill="both", expand=True)
 
+        # The algorithms count into here, the stats labels get refreshed from it at most every 0.1 s
+        self.metrics = Metrics()
+
+        # Solutions, solution counts and ratings survive restarts in here
+        self.solution_store = SolutionStore(os.path.join(os.path.dirname(__file__), "solution_store.sqlite3"))
+
         # Board
         self.board = Board9x9(master=self.main_frame, main_gui=self, width=500)
         self.generator = Generator(main_gui=self, board=self.board)
@@ -1260,7 +981,9 @@ class MainGUI:
                 Algorithm.SOLVING.ELIMINATION_OPTIMIZED.value,
                 Algorithm.SOLVING.BACKTRACKING.value,
                 Algorithm.SOLVING.BACKTRACKING_OPTIMIZED.value,
-                Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING.value
+                Algorithm.SOLVING.ELIMINATION_OPTIMIZED_PLUS_BACKTRACKING.value,
+                Algorithm.SOLVING.BACKTRACKING_MRV.value,
+                Algorithm.SOLVING.DANCING_LINKS.value
             ],
             state="readonly",
             border_color=cd["black"],
@@ -1464,6 +1187,33 @@ class MainGUI:
         self.reductions_by_sudoku_label.value = 0
         self.reductions_by_sudoku_label.grid(row=4, padx=(25, 0), pady=(10, 0), sticky="w")
 
+        self.reductions_by_hidden_subsets_label = ValueLabel(
+            master=self.statistics_4_nerds_frame,
+            init_text="Reductions made by hidden subsets",
+            font=("Arial", 20),
+            text_color=cd["black"]
+        )
+        self.reductions_by_hidden_subsets_label.value = 0
+        self.reductions_by_hidden_subsets_label.grid(row=5, padx=(25, 0), pady=(10, 0), sticky="w")
+
+        self.reductions_by_locked_candidates_label = ValueLabel(
+            master=self.statistics_4_nerds_frame,
+            init_text="Reductions made by locked candidates",
+            font=("Arial", 20),
+            text_color=cd["black"]
+        )
+        self.reductions_by_locked_candidates_label.value = 0
+        self.reductions_by_locked_candidates_label.grid(row=6, padx=(25, 0), pady=(10, 0), sticky="w")
+
+        self.reductions_by_fish_label = ValueLabel(
+            master=self.statistics_4_nerds_frame,
+            init_text="Reductions made by fish",
+            font=("Arial", 20),
+            text_color=cd["black"]
+        )
+        self.reductions_by_fish_label.value = 0
+        self.reductions_by_fish_label.grid(row=7, padx=(25, 0), pady=(10, 0), sticky="w")
+
         self.constellations_checked_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
             init_text="Constellations checked",
@@ -1471,7 +1221,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.constellations_checked_label.value = 0
-        self.constellations_checked_label.grid(row=5, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.constellations_checked_label.grid(row=8, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.recursions_checked_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1480,7 +1230,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.recursions_checked_label.value = 0
-        self.recursions_checked_label.grid(row=6, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.recursions_checked_label.grid(row=9, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.generating_alg_label = ctk.CTkLabel(
             master=self.statistics_4_nerds_frame,
@@ -1488,7 +1238,7 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.generating_alg_label.grid(row=7, padx=(25, 0), pady=(35, 25), sticky="w")
+        self.generating_alg_label.grid(row=10, padx=(25, 0), pady=(35, 25), sticky="w")
 
         self.recursions_made_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1497,7 +1247,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.recursions_made_label.value = 0
-        self.recursions_made_label.grid(row=8, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.recursions_made_label.grid(row=11, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.reductions_checked_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1506,7 +1256,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.reductions_checked_label.value = 0
-        self.reductions_checked_label.grid(row=9, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.reductions_checked_label.grid(row=12, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.board_label = ctk.CTkLabel(
             master=self.statistics_4_nerds_frame,
@@ -1514,7 +1264,7 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.board_label.grid(row=10, padx=(25, 0), pady=(35, 25), sticky="w")
+        self.board_label.grid(row=13, padx=(25, 0), pady=(35, 25), sticky="w")
 
         self.board_unique_solution_label = ctk.CTkLabel(
             master=self.statistics_4_nerds_frame,
@@ -1522,7 +1272,7 @@ class MainGUI:
             text_color=cd["red"],
             font=("Arial", 20)
         )
-        self.board_unique_solution_label.grid(row=11, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.board_unique_solution_label.grid(row=14, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.board_solved_status_label = ctk.CTkLabel(
             master=self.statistics_4_nerds_frame,
@@ -1530,7 +1280,7 @@ class MainGUI:
             text_color=cd["red"],
             font=("Arial", 20)
         )
-        self.board_solved_status_label.grid(row=12, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.board_solved_status_label.grid(row=15, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.numbers_given_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1539,7 +1289,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.numbers_given_label.value = 0
-        self.numbers_given_label.grid(row=13, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.numbers_given_label.grid(row=16, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.numbers_resolved_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1548,7 +1298,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.numbers_resolved_label.value = 0
-        self.numbers_resolved_label.grid(row=14, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.numbers_resolved_label.grid(row=17, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.numbers_unresolved_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1557,7 +1307,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         self.numbers_unresolved_label.value = 81
-        self.numbers_unresolved_label.grid(row=15, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.numbers_unresolved_label.grid(row=18, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.possible_values_remaining_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1566,7 +1316,7 @@ class MainGUI:
             text_color=cd["black"]
         )
         # self.possible_values_remaining_label.value = self.board.get_possible_value_count()
-        self.possible_values_remaining_label.grid(row=16, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.possible_values_remaining_label.grid(row=19, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.cell_label = ctk.CTkLabel(
             master=self.statistics_4_nerds_frame,
@@ -1574,7 +1324,7 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.cell_label.grid(row=17, padx=(25, 0), pady=(35, 25), sticky="w")
+        self.cell_label.grid(row=20, padx=(25, 0), pady=(35, 25), sticky="w")
 
         self.cell_row_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1582,7 +1332,7 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.cell_row_label.grid(row=18, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.cell_row_label.grid(row=21, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.cell_col_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1590,7 +1340,7 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.cell_col_label.grid(row=19, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.cell_col_label.grid(row=22, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.cell_value_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1598,7 +1348,7 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.cell_value_label.grid(row=20, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.cell_value_label.grid(row=23, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.cell_pV_label = ValueLabel(
             master=self.statistics_4_nerds_frame,
@@ -1606,19 +1356,43 @@ class MainGUI:
             font=("Arial", 20),
             text_color=cd["black"]
         )
-        self.cell_pV_label.grid(row=21, padx=(25, 0), pady=(10, 0), sticky="w")
+        self.cell_pV_label.grid(row=24, padx=(25, 0), pady=(10, 0), sticky="w")
 
         self.spacer_label = ctk.CTkLabel(
             master=self.statistics_4_nerds_frame,
             width=500,
             text=""
         )
-        self.spacer_label.grid(row=22)
+        self.spacer_label.grid(row=25)
+
+        self.metric_labels = {
+            "recursions_checked": self.recursions_checked_label,
+            "recursions_made": self.recursions_made_label,
+            "reductions_checked": self.reductions_checked_label,
+            "reductions_by_constellations": self.reductions_by_constellation_label,
+            "reductions_by_sudoku": self.reductions_by_sudoku_label,
+            "reductions_by_hidden_subsets": self.reductions_by_hidden_subsets_label,
+            "reductions_by_locked_candidates": self.reductions_by_locked_candidates_label,
+            "reductions_by_fish": self.reductions_by_fish_label,
+            "constellations_checked": self.constellations_checked_label,
+        }
+        self.metrics.subscribe(self.update_metric_labels, interval=0.1)
 
         self.root.bind("<Key>", self.on_key_press)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.root.mainloop()
 
+    def on_close(self):
+        """closes the solution store before the window goes away, so its SQLite file is left clean"""
+        self.solution_store.close()
+        self.root.destroy()
+
+    def update_metric_labels(self, snapshot):
+        for name, value in snapshot["counters"].items():
+            if name in self.metric_labels and self.metric_labels[name].value != value:
+                self.metric_labels[name].value = value
+
     @property
     def current_alg_type(self):
         return self._current_alg_type
@@ -1630,7 +1404,9 @@ class MainGUI:
         alg_label_handler(main_gui=self, alg_type=alg_type)
 
     def solve(self):
-        if self.show_alg:
+        if self.solve_until is not SolveType.COMPLETE:
+            self.background_solver.solve_step()
+        elif self.show_alg:
             self.solver.solve()
         else:
             self.background_solver.solve()